@@ -6,8 +6,46 @@ visualisation methods generated through the matplotlib library in Python.
 It also aims to speed up the process of producing publishable-quality 
 figures by directly producing PDF images that can be inserted into 
 documents.
+
+Subpackages and functions are imported on first use, so importing the
+package does not load matplotlib.pyplot or the I/O dependencies.
 '''
 
+import importlib
+import os
+
 __version__ = '0.3.0'
 
-from .io import inkscape, write_pdf, save_figure, load_figure
\ No newline at end of file
+_submodules = ("io", "plot", "headless")
+
+_lazy_attributes = {"use_headless": ".headless",
+                    "new_figure":   ".headless",
+                    "inkscape":     ".io",
+                    "write_pdf":    ".io",
+                    "write_svg":    ".io",
+                    "write_figure": ".io",
+                    "save_figure":  ".io",
+                    "load_figure":  ".io",
+                    "write_many":   ".io",
+                    }
+
+__all__ = [*_submodules, *_lazy_attributes]
+
+
+def __getattr__(name):
+
+    if name in _submodules:
+        return importlib.import_module("." + name, __name__)
+    if name in _lazy_attributes:
+        return getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get("PYPLOTFORMAT_HEADLESS", "").lower() in ("1", "true", "yes"):
+    importlib.import_module(".headless", __name__)
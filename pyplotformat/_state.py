@@ -0,0 +1,23 @@
+'''
+Formatting state stored on matplotlib figures.
+
+The state is kept in a plain dict attribute of the `Figure`, so it is saved and restored with the
+figure (e.g. by pickle) and can be shared between the plot and io subpackages.
+'''
+
+_STATE_ATTRIBUTE = "_pyplotformat_state"
+
+
+def figure_state(figure) -> dict:
+    '''Get the pyplotformat state dict of a figure, creating it if required.'''
+    state = getattr(figure, _STATE_ATTRIBUTE, None)
+    if state is None:
+        state = {}
+        setattr(figure, _STATE_ATTRIBUTE, state)
+
+    return state
+
+
+def peek_state(figure) -> dict:
+    '''Get the pyplotformat state dict of a figure without creating it. Empty if not formatted.'''
+    return getattr(figure, _STATE_ATTRIBUTE, None) or {}
@@ -0,0 +1,83 @@
+'''
+Utilities to create and format figures without importing matplotlib.pyplot.
+
+Importing pyplot selects a GUI backend and registers every figure with the pyplot figure manager.
+Neither is needed by workers that only format and write figures. In headless mode figures are
+created directly as `matplotlib.figure.Figure` objects attached to an Agg canvas.
+
+Headless mode can also be enabled before the package is imported by setting the environment
+variable `PYPLOTFORMAT_HEADLESS=1`.
+'''
+
+import os
+import sys
+
+import matplotlib
+from matplotlib.figure import Figure
+
+_headless = False
+
+
+def use_headless(backend : str = "agg") -> None:
+    '''Enable headless mode.
+
+    Selects a non-interactive matplotlib backend without importing pyplot, and makes figures
+    created by pyplotformat (e.g. legends) independent of the pyplot figure manager.
+
+    Parameters
+    ----------
+    backend : str, optional
+        Non-interactive matplotlib backend to use. (default value is 'agg')
+    '''
+    global _headless # pylint: disable=global-statement
+    _headless = True
+    matplotlib.use(backend)
+
+
+def is_headless() -> bool:
+    '''True if headless mode has been enabled.'''
+    return _headless
+
+
+def _new_figure(**kwargs) -> Figure:
+
+    # Use pyplot only when it is already in use, so interactive sessions can still show figures
+    # =============================================================================================
+    if not _headless and "matplotlib.pyplot" in sys.modules:
+        return sys.modules["matplotlib.pyplot"].figure(**kwargs)
+
+    from matplotlib.backends import backend_agg # pylint: disable=import-outside-toplevel
+
+    figure = Figure(**kwargs)
+    backend_agg.FigureCanvasAgg(figure)
+
+    return figure
+
+
+def new_figure(subplot_kw : dict = None, **kwargs) -> tuple:
+    '''Create a figure with a single axes, equivalent to `matplotlib.pyplot.subplots()`.
+
+    In headless mode, or when pyplot has not been imported, the figure is created without pyplot.
+
+    Parameters
+    ----------
+    subplot_kw : dict, optional
+        Kwargs passed to `Figure.add_subplot`, e.g. `{'projection': 'polar'}`.
+    **kwargs : dict, optional
+        Kwargs passed to the `Figure` constructor.
+
+    Returns
+    -------
+    figure : matplotlib.figure.Figure
+        New `Figure` object.
+    axes : matplotlib.axes.Axes
+        New `Axes` object.
+    '''
+    figure = _new_figure(**kwargs)
+    axes = figure.add_subplot(**(subplot_kw or {}))
+
+    return figure, axes
+
+
+if os.environ.get("PYPLOTFORMAT_HEADLESS", "").lower() in ("1", "true", "yes"):
+    use_headless()
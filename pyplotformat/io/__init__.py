@@ -1,7 +1,34 @@
 '''
 This subpackage provides utility functions for the pyPlotFormat package.
+
+Functions are imported from their modules on first use.
 '''
 
-from .save import save_figure, load_figure
-from .write import write_pdf
-from .inkscaper import inkscape
+import importlib
+
+_lazy_attributes = {"save_figure":  ".save",
+                    "load_figure":  ".save",
+                    "write_pdf":    ".write",
+                    "write_svg":    ".write",
+                    "write_figure": ".write",
+                    "inkscape":     ".inkscaper",
+                    "write_many":   ".batch",
+                    "BatchResult":  ".batch",
+                    "FigureArchive": ".archive",
+                    "BackgroundWriter": ".background",
+                    }
+
+__all__ = list(_lazy_attributes)
+
+
+def __getattr__(name):
+
+    if name in _lazy_attributes:
+        return getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,759 @@
+'''
+Compact data-only figure archive used by `save_figure` and `load_figure`.
+
+A figure record stores only the plotted data and the formatter settings:
+
+- An 8 byte magic string and the length of the header as a little-endian uint64.
+- A JSON header describing the figure, its axes, lines and collections, the formatter and its
+  kwargs, and the dtype, shape and offset of each data array.
+- The data arrays in a binary columnar layout, each aligned to 64 bytes.
+
+Arrays are memory-mapped when a record is read, so opening a record is independent of the amount
+of data. The figure is rebuilt from the data and the formatter is replayed to restore formatting.
+
+Many figure records can be stored in a single file with `FigureArchive`.
+'''
+
+import json
+import os
+import struct
+import warnings
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+from matplotlib import colors as mcolors
+from matplotlib import collections as mcoll
+from matplotlib import transforms as mtransforms
+from matplotlib.gridspec import GridSpec, SubplotSpec
+from matplotlib.lines import Line2D
+from matplotlib.path import Path as MplPath
+
+from .._state import figure_state, peek_state
+from ..headless import _new_figure
+
+_MAGIC = b"PPFARCH1"
+_VERSION = 1
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")
+
+# Formatting stages whose result is fully stored in the archive (line colors, limits and scales).
+# They are not re-applied when the formatter is replayed on the same data, so loading does not
+# read all the line data. Decimated lines are stored with their full data and decimated again.
+_STORED_STAGES = ("_format_line_colors",
+                  "_format_axes_limits",
+                  "_format_axes_scale")
+
+
+def _align(offset : int) -> int:
+
+    return -(-offset//_ALIGN)*_ALIGN
+
+
+def _jsonable(value):
+
+    # Convert kwargs and artist properties to JSON types. Unknown objects are stored as strings
+    # =============================================================================================
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
+
+
+class _ArrayTable():
+    '''Collects the data arrays of a record and assigns their offsets.'''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.arrays = []
+        self.entries = []
+        self.size = 0
+
+    def add(self, data, dtype=None) -> int:
+        '''Add an array and return its index in the table.'''
+        if np.ma.isMaskedArray(data):
+            data = np.ma.filled(data.astype(float), np.nan)
+        data = np.ascontiguousarray(data, dtype=dtype)
+
+        offset = _align(self.size)
+        self.arrays.append(data)
+        self.entries.append({"dtype": data.dtype.str, "shape": list(data.shape), "offset": offset})
+        self.size = offset + data.nbytes
+
+        return len(self.arrays) - 1
+
+
+def _float_data(data, convert):
+
+    # Original data avoids a copy. Unit data (e.g. dates) is stored as the converted values
+    # =============================================================================================
+    try:
+        return np.ma.asarray(data, dtype=float) if np.ma.isMaskedArray(data) \
+            else np.asarray(data, dtype=float)
+    except (TypeError, ValueError):
+        return np.asarray(convert(data), dtype=float)
+
+
+def _encode_marker(marker):
+
+    # Markers as JSON values. Polygon markers (numsides, style, angle), vertices and paths are
+    # stored as dicts so they are not read back as another kind of marker
+    # =============================================================================================
+    if isinstance(marker, (str, int)) and not isinstance(marker, bool):
+        return marker
+    if isinstance(marker, tuple) and all(isinstance(v, (int, float)) for v in marker):
+        return {"polygon": list(marker)}
+    if isinstance(marker, MplPath):
+        return {"path": marker.vertices.tolist(),
+                "codes": None if marker.codes is None else marker.codes.tolist()}
+
+    try:
+        vertices = np.asarray(marker, dtype=float)
+    except (TypeError, ValueError):
+        vertices = None
+    if vertices is not None and vertices.ndim == 2 and vertices.shape[1] == 2:
+        return {"vertices": vertices.tolist()}
+
+    raise ValueError("Marker {!r} is not supported by the figure archive".format(marker))
+
+
+def _decode_marker(marker):
+
+    if not isinstance(marker, dict):
+        return marker
+    if "polygon" in marker:
+        return tuple(marker["polygon"])
+    if "path" in marker:
+        return MplPath(marker["path"], marker["codes"])
+
+    return np.asarray(marker["vertices"])
+
+
+def _marker_color(line, color) -> str:
+
+    # Marker colors equal to the line color are stored as 'auto', so they follow the line color
+    # =============================================================================================
+    if mcolors.to_rgba(color) == mcolors.to_rgba(line.get_color()):
+        return "auto"
+
+    return mcolors.to_hex(color, keep_alpha=True)
+
+
+def _encode_line(line, table, hidden) -> dict:
+
+    # Lines hidden by the consolidation stage are saved as they were plotted, the formatter
+    # consolidates them again when it is replayed. Decimated lines are saved with their original
+    # data and decimated again by the formatter
+    # =============================================================================================
+    from ..plot.decimate import original_data # pylint: disable=import-outside-toplevel
+
+    x, y = original_data(line)
+
+    return {"x":            table.add(_float_data(x, line.convert_xunits)),
+            "y":            table.add(_float_data(y, line.convert_yunits)),
+            "label":        hidden.get(line, line.get_label()),
+            "visible":      line.get_visible() or line in hidden,
+            "color":        mcolors.to_hex(line.get_color(), keep_alpha=True),
+            "linestyle":    line.get_linestyle(),
+            "linewidth":    line.get_linewidth(),
+            "drawstyle":    line.get_drawstyle(),
+            "marker":       _encode_marker(line.get_marker()),
+            "markersize":   line.get_markersize(),
+            "fillstyle":    line.get_fillstyle(),
+            "markerfacecolor": _marker_color(line, line.get_markerfacecolor()),
+            "markeredgecolor": _marker_color(line, line.get_markeredgecolor()),
+            "alpha":        line.get_alpha(),
+            "zorder":       line.get_zorder(),
+            }
+
+
+def _collection_kind(collection):
+
+    if isinstance(collection, mcoll.LineCollection):
+        return "line"
+    if isinstance(collection, mcoll.PathCollection):
+        return "path"
+    if isinstance(collection, mcoll.PolyCollection):
+        return "poly"
+
+    return None
+
+
+def _encode_collection(collection, table) -> dict:
+
+    kind = _collection_kind(collection)
+    paths = collection.get_paths()
+
+    entry = {   "kind":         kind,
+                "vertices":     table.add(np.concatenate([p.vertices for p in paths])
+                                          if paths else np.empty((0, 2))),
+                "lengths":      table.add([len(p.vertices) for p in paths], dtype=np.int64),
+                "facecolors":   table.add(collection.get_facecolor(), dtype=float),
+                "edgecolors":   table.add(collection.get_edgecolor(), dtype=float),
+                "linewidths":   table.add(collection.get_linewidth(), dtype=float),
+                "label":        collection.get_label(),
+                "alpha":        collection.get_alpha(),
+                "zorder":       collection.get_zorder(),
+                }
+
+    if kind == "path":
+        codes = [p.codes if p.codes is not None else
+                 np.full(len(p.vertices), MplPath.LINETO, dtype=np.uint8) for p in paths]
+        entry["codes"] = table.add(np.concatenate(codes) if codes else [], dtype=np.uint8)
+        entry["offsets"] = table.add(collection.get_offsets(), dtype=float)
+        entry["sizes"] = table.add(collection.get_sizes(), dtype=float)
+
+    return entry
+
+
+def _encode_axes(axes, table, state) -> dict:
+
+    # Artists added by formatting stages are not data, they are added again by the formatter
+    # =============================================================================================
+    hidden = state.get("consolidated", {})
+    added = {id(artist) for artists in state.get("artists", {}).values() for artist in artists}
+
+    entry = {   "projection":   axes.name,
+                "position":     list(axes.get_position(original=True).bounds),
+                "xlabel":       axes.get_xlabel(),
+                "ylabel":       axes.get_ylabel(),
+                "title":        axes.get_title(),
+                "xlim":         list(axes.get_xlim()),
+                "ylim":         list(axes.get_ylim()),
+                "xscale":       axes.get_xscale(),
+                "yscale":       axes.get_yscale(),
+                "lines":        [_encode_line(line, table, hidden) for line in axes.get_lines()],
+                "collections":  [],
+                }
+
+    for collection in axes.collections:
+        if id(collection) in added:
+            continue
+        if _collection_kind(collection) is None:
+            warnings.warn("{} objects are not supported by the figure archive and are not saved"
+                          .format(type(collection).__name__))
+            continue
+        entry["collections"].append(_encode_collection(collection, table))
+
+    if axes.images or axes.patches:
+        warnings.warn("Images and patches are not supported by the figure archive and are not "
+                      "saved")
+
+    return entry
+
+
+def _encode_subplots(figure) -> tuple[list, list]:
+
+    # Grid of each subplot and the earlier axes it shares its x and y axis with, so that a grid
+    # is rebuilt with add_subplot. Axes outside a top level GridSpec are only placed by position
+    # =============================================================================================
+    gridspecs, subplots = [], []
+    axes_list = figure.get_axes()
+
+    for index, axes in enumerate(axes_list):
+        spec = axes.get_subplotspec()
+        gridspec = spec.get_gridspec() if spec is not None else None
+        subplot = None
+        if isinstance(gridspec, GridSpec):
+            if not any(gridspec is other for other in gridspecs):
+                gridspecs.append(gridspec)
+            subplot = [next(i for i, other in enumerate(gridspecs) if gridspec is other),
+                       int(spec.num1), int(spec.num2)]
+
+        shared = {}
+        for name, group in (("sharex", axes.get_shared_x_axes()),
+                            ("sharey", axes.get_shared_y_axes())):
+            siblings = group.get_siblings(axes)
+            shared[name] = next((i for i, other in enumerate(axes_list[:index])
+                                 if other in siblings), None)
+
+        subplots.append({"subplot": subplot, **shared})
+
+    return gridspecs, subplots
+
+
+def _encode_gridspec(figure, gridspec) -> dict:
+
+    params = gridspec.get_subplot_params(figure)
+
+    return {"shape":            [int(n) for n in gridspec.get_geometry()],
+            "width_ratios":     [float(r) for r in gridspec.get_width_ratios()],
+            "height_ratios":    [float(r) for r in gridspec.get_height_ratios()],
+            **{name: float(getattr(params, name))
+               for name in ("left", "right", "bottom", "top", "wspace", "hspace")}}
+
+
+def _encode_figure(figure) -> tuple[dict, list]:
+
+    # Header of a figure record and the list of data arrays it refers to
+    # =============================================================================================
+    from ..plot.fingerprint import data_signature # pylint: disable=import-outside-toplevel
+
+    table = _ArrayTable()
+    state = peek_state(figure)
+    gridspecs, subplots = _encode_subplots(figure)
+
+    # The signature is the one the stored digests were computed with. It is also kept for
+    # decimated lines, which are saved with their full data and decimated again when replayed
+    header = {  "version":      _VERSION,
+                "size":         list(figure.get_size_inches()),
+                "formatter":    _jsonable(state.get("formatter")),
+                "kwargs":       _jsonable(state.get("kwargs", {})),
+                "digests":      {k: v for k, v in state.get("digests", {}).items()
+                                 if k in _STORED_STAGES},
+                "signature":    data_signature(figure),
+                "gridspecs":    [_encode_gridspec(figure, gridspec) for gridspec in gridspecs],
+                "axes":         [{**_encode_axes(axes, table, state), **subplot}
+                                 for axes, subplot in zip(figure.get_axes(), subplots)],
+                "arrays":       table.entries,
+                }
+
+    return header, table.arrays
+
+
+def _write_record(out_file, figure) -> int:
+    '''Write a figure record at the current position of a binary file and return its length.'''
+    header, arrays = _encode_figure(figure)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+
+    start = out_file.tell()
+    out_file.write(_PREFIX.pack(_MAGIC, len(header_bytes)))
+    out_file.write(header_bytes)
+
+    data_start = _align(_PREFIX.size + len(header_bytes))
+    for array, entry in zip(arrays, header["arrays"]):
+        position = data_start + entry["offset"]
+        out_file.write(b"\0"*(position - (out_file.tell() - start)))
+        if array.size:
+            out_file.write(memoryview(array).cast("B"))
+
+    return out_file.tell() - start
+
+
+def _is_record(filename, offset : int = 0) -> bool:
+    '''True if a figure record starts at `offset` of the file.'''
+    with open(filename, "rb") as in_file:
+        in_file.seek(offset)
+        return in_file.read(len(_MAGIC)) == _MAGIC
+
+
+def _read_record(filename, offset : int = 0) -> tuple[dict, list]:
+    '''Read the header of a figure record and memory-map its data arrays as views of one map.'''
+    with open(filename, "rb") as in_file:
+        in_file.seek(offset)
+        magic, header_length = _PREFIX.unpack(in_file.read(_PREFIX.size))
+        if magic != _MAGIC:
+            raise ValueError("{} does not contain a figure record at offset {}"
+                             .format(filename, offset))
+        header = json.loads(in_file.read(header_length))
+
+    if header["version"] > _VERSION:
+        raise ValueError("Figure record version {} is not supported by this version of "
+                         "pyplotformat".format(header["version"]))
+
+    data_start = offset + _align(_PREFIX.size + header_length)
+    shapes = [tuple(entry["shape"]) for entry in header["arrays"]]
+    dtypes = [np.dtype(entry["dtype"]) for entry in header["arrays"]]
+    data_end = max((entry["offset"] + dtype.itemsize*int(np.prod(shape)) for entry, dtype, shape
+                    in zip(header["arrays"], dtypes, shapes)), default=0)
+
+    # The data of the record is mapped once, each array is a view of the mapping, so a figure
+    # holds a single file descriptor however many arrays it has
+    data = np.empty(0, dtype=np.uint8)
+    if data_end:
+        data = np.memmap(filename, dtype=np.uint8, mode="r", offset=data_start,
+                         shape=(data_end,)).view(np.ndarray)
+
+    arrays = []
+    for entry, dtype, shape in zip(header["arrays"], dtypes, shapes):
+        nbytes = dtype.itemsize*int(np.prod(shape))
+        if nbytes == 0:
+            arrays.append(np.empty(shape, dtype=dtype))
+        else:
+            arrays.append(data[entry["offset"]:entry["offset"] + nbytes].view(dtype)
+                          .reshape(shape))
+
+    return header, arrays
+
+
+# Private Line2D attributes holding the original data and its cache state
+_LINE_DATA_ATTRIBUTES = ("_xorig", "_yorig", "_invalidx", "_invalidy")
+
+
+def _set_line_data(line, x, y) -> None:
+
+    # Line2D.set_data copies its input, which would read all memory-mapped data. The original
+    # data is set directly so it is only read when the line is drawn. This relies on the private
+    # Line2D attributes used by matplotlib 1.x to 3.11, other versions fall back to set_data.
+    # =============================================================================================
+    if not all(hasattr(line, name) for name in _LINE_DATA_ATTRIBUTES):
+        line.set_data(x, y)
+        return
+
+    line._xorig = x # pylint: disable=protected-access
+    line._yorig = y # pylint: disable=protected-access
+    line._invalidx = True # pylint: disable=protected-access
+    line._invalidy = True # pylint: disable=protected-access
+    line.stale = True
+
+
+def _decode_line(axes, entry, arrays) -> None:
+
+    line = Line2D([], [], label=entry["label"], color=entry["color"],
+                  linestyle=entry["linestyle"], linewidth=entry["linewidth"],
+                  drawstyle=entry["drawstyle"], marker=_decode_marker(entry["marker"]),
+                  markersize=entry["markersize"], fillstyle=entry.get("fillstyle", "full"),
+                  markerfacecolor=entry.get("markerfacecolor", "auto"),
+                  markeredgecolor=entry.get("markeredgecolor", "auto"), alpha=entry["alpha"],
+                  zorder=entry["zorder"], visible=entry.get("visible", True))
+    _set_line_data(line, arrays[entry["x"]], arrays[entry["y"]])
+
+    # add_line would compute the data limits from all points. The saved limits are used instead.
+    axes.add_artist(line)
+
+
+def _split(vertices, lengths) -> list:
+
+    return np.split(np.asarray(vertices), np.cumsum(lengths)[:-1]) if len(lengths) else []
+
+
+def _decode_collection(axes, entry, arrays) -> None:
+
+    segments = _split(arrays[entry["vertices"]], arrays[entry["lengths"]])
+    style = {   "facecolors":   arrays[entry["facecolors"]],
+                "edgecolors":   arrays[entry["edgecolors"]],
+                "linewidths":   arrays[entry["linewidths"]],
+                "label":        entry["label"],
+                "alpha":        entry["alpha"],
+                "zorder":       entry["zorder"],
+                }
+
+    if entry["kind"] == "line":
+        style.pop("facecolors")
+        collection = mcoll.LineCollection(segments, colors=style.pop("edgecolors"), **style)
+    elif entry["kind"] == "poly":
+        collection = mcoll.PolyCollection(segments, **style)
+    else:
+        codes = _split(arrays[entry["codes"]], arrays[entry["lengths"]])
+        paths = [MplPath(v, c) for v, c in zip(segments, codes)]
+        collection = mcoll.PathCollection(paths, arrays[entry["sizes"]],
+                                          offsets=arrays[entry["offsets"]],
+                                          offset_transform=axes.transData, **style)
+        collection.set_transform(mtransforms.IdentityTransform())
+
+    axes.add_collection(collection, autolim=False)
+
+
+def _decode_axes(figure, entry, arrays, gridspecs, decoded):
+
+    # Subplots are added to their grid so that formatting can tell outer and inner panels apart,
+    # the saved position is kept for figures that were laid out after the grid was created
+    # =============================================================================================
+    shared = {name: decoded[entry[name]] if entry.get(name) is not None else None
+              for name in ("sharex", "sharey")}
+    if entry.get("subplot") is None:
+        axes = figure.add_axes(entry["position"], projection=entry["projection"], **shared)
+    else:
+        gridspec, num1, num2 = entry["subplot"]
+        spec = SubplotSpec(gridspecs[gridspec], num1, num2)
+        axes = figure.add_subplot(spec, projection=entry["projection"], **shared)
+        if not np.allclose(axes.get_position(original=True).bounds, entry["position"]):
+            axes.set_position(entry["position"])
+            axes.set_in_layout(True)
+
+    for line in entry["lines"]:
+        _decode_line(axes, line, arrays)
+    for collection in entry["collections"]:
+        _decode_collection(axes, collection, arrays)
+
+    axes.set_xscale(entry["xscale"])
+    axes.set_yscale(entry["yscale"])
+    axes.set_xlim(entry["xlim"])
+    axes.set_ylim(entry["ylim"])
+    axes.set_xlabel(entry["xlabel"])
+    axes.set_ylabel(entry["ylabel"])
+    axes.set_title(entry["title"])
+
+    return axes
+
+
+def _replay_formatter(figure, header) -> None:
+
+    # Re-apply the formatter recorded when the figure was saved
+    # =============================================================================================
+    if not header["formatter"]:
+        return
+
+    from .. import plot # pylint: disable=import-outside-toplevel
+
+    name, shape, fontsize = header["formatter"]
+    formatter_class = getattr(plot, name, None)
+    if formatter_class is None:
+        warnings.warn("Formatter {} is not available, the figure is loaded unformatted"
+                      .format(name))
+        return
+
+    # The saved signature matches the restored data, so the data is not read to compute it
+    state = figure_state(figure)
+    state["digests"] = dict(header["digests"])
+    if header.get("signature"):
+        state["signature"] = header["signature"]
+    kwargs = dict(header["kwargs"])
+    kwargs["show"] = False
+    formatter_class(shape, fontsize)(figure, **kwargs)
+
+
+def _decode_figure(header, arrays, reformat : bool = True):
+
+    figure = _new_figure(figsize=header["size"])
+    gridspecs = [figure.add_gridspec(*gridspec.pop("shape"), **gridspec)
+                 for gridspec in header.get("gridspecs", [])]
+    decoded = []
+    for entry in header["axes"]:
+        decoded.append(_decode_axes(figure, entry, arrays, gridspecs, decoded))
+
+    if reformat:
+        _replay_formatter(figure, header)
+    elif header["formatter"]:
+        figure_state(figure)["kwargs"] = dict(header["kwargs"])
+
+    return figure
+
+
+# =================================================================================================
+# Multi-figure archive
+# =================================================================================================
+
+_ARCHIVE_MAGIC = b"PPFFIGS1"
+# Magic string, offset and length of the index
+_ARCHIVE_PREFIX = struct.Struct("<8sQQ")
+
+
+def _load_archived(filename, key, reformat=True):
+
+    # Module level so builders can be sent to worker processes
+    # =============================================================================================
+    return FigureArchive(filename).load(key, reformat=reformat)
+
+
+class FigureArchive():
+    '''Single file container holding many saved figures.
+
+    Figures are stored as figure records (see `save_figure`) followed by an index of the key,
+    offset and length of each record. The fixed size header at the start of the file points to
+    the index. Appending writes the new records after the current index, then writes the new
+    index and rewrites the header last, so existing records and the current index are never
+    overwritten. If the process stops before the archive is flushed or closed, the archive still
+    contains every figure of the last flush.
+
+    Figures are loaded individually by key and their data is memory-mapped, so opening the
+    archive only reads the header and index.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the archive file. Does not require an extension, '.figs' is used.
+    mode : str, {r, a, w}, optional
+        'r' opens an existing archive for reading, 'a' opens an archive for appending and creates
+        it if it does not exist, 'w' creates a new empty archive. (default value is 'r')
+
+    Examples
+    --------
+    >>> with FigureArchive("results", mode="a") as archive:
+    ...     archive.append("run_001", fig)
+    >>> archive = FigureArchive("results")
+    >>> fig, ax = archive.load("run_001")
+    '''
+
+    def __init__(self, filename, mode : str = "r") -> None:
+        if mode not in ("r", "a", "w"):
+            raise ValueError("Archive mode '{}' not recognized. Options are r, a, w".format(mode))
+
+        self.filename = Path(filename).with_suffix(".figs")
+        self.mode = mode
+        self._index = {}
+        # End of the last record or index written, where new records and the index are written
+        self._end = _ARCHIVE_PREFIX.size
+        self._out_file = None
+        # True if records were appended since the index was last written
+        self._modified = False
+
+        if mode == "w" or (mode == "a" and not self.filename.exists()):
+            with open(self.filename, "wb") as out_file:
+                out_file.write(_ARCHIVE_PREFIX.pack(_ARCHIVE_MAGIC, 0, 0))
+        else:
+            self._read_index()
+
+    def __repr__(self) -> str:
+        return "FigureArchive({!r}, mode={!r}, figures={})".format(str(self.filename), self.mode,
+                                                                  len(self))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def keys(self) -> list:
+        '''Keys of the saved figures in the order they were added.'''
+        return list(self._index)
+
+    def _read_index(self) -> None:
+
+        with open(self.filename, "rb") as in_file:
+            magic, offset, length = _ARCHIVE_PREFIX.unpack(in_file.read(_ARCHIVE_PREFIX.size))
+            if magic != _ARCHIVE_MAGIC:
+                raise ValueError("{} is not a figure archive".format(self.filename))
+            if length:
+                self._end = offset + length
+                in_file.seek(offset)
+                self._index = {key: (start, size) for key, start, size in
+                               json.loads(in_file.read(length))}
+
+    def append(self, key : str, figure) -> None:
+        '''Add a figure to the archive.
+
+        The index is written when the archive is closed or flushed, figures appended since the
+        last flush are not part of the archive until then. A figure saved with an existing key
+        replaces it, the old record is left unused in the file.
+
+        Parameters
+        ----------
+        key : str
+            Key used to load the figure.
+        figure : matplotlib.figure.Figure
+            Figure to be saved.
+        '''
+        if self.mode == "r":
+            raise ValueError("Figures cannot be appended to an archive opened with mode 'r'")
+
+        if self._out_file is None:
+            self._out_file = open(self.filename, "r+b") # pylint: disable=consider-using-with
+
+        # New records are written after the current index, which stays valid until the new index
+        # is written on flush. Records are aligned so their arrays are aligned in the file
+        start = _align(self._end)
+        self._out_file.seek(self._end)
+        self._out_file.write(b"\0"*(start - self._end))
+
+        self._index[str(key)] = (start, _write_record(self._out_file, figure))
+        self._end = self._out_file.tell()
+        self._modified = True
+
+    def flush(self) -> None:
+        '''Write the index of the archive and point the header to it.'''
+        if self._out_file is None or not self._modified:
+            return
+
+        index = json.dumps([[k, *v] for k, v in self._index.items()],
+                           separators=(",", ":")).encode()
+
+        self._out_file.seek(self._end)
+        self._out_file.write(index)
+        self._out_file.truncate()
+        self._out_file.flush()
+        os.fsync(self._out_file.fileno())
+
+        # The header is only updated once the records and the index are on disk
+        self._out_file.seek(0)
+        self._out_file.write(_ARCHIVE_PREFIX.pack(_ARCHIVE_MAGIC, self._end, len(index)))
+        self._out_file.flush()
+        os.fsync(self._out_file.fileno())
+
+        self._end += len(index)
+        self._modified = False
+
+    def close(self) -> None:
+        '''Write the index and close the archive file.'''
+        if self._out_file is None:
+            return
+
+        self.flush()
+        self._out_file.close()
+        self._out_file = None
+
+    def load(self, key : str, reformat : bool = True):
+        '''Load a single figure from the archive.
+
+        Parameters
+        ----------
+        key : str
+            Key of the figure.
+        reformat : bool, optional
+            If `True` the saved formatter is applied to the loaded figure. (default value is
+            `True`)
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            Loaded `Figure` object.
+        axes : matplotlib.axes.Axes
+            First `Axes` object of the figure.
+        '''
+        try:
+            offset, _ = self._index[key]
+        except KeyError:
+            raise KeyError("Figure '{}' not found in {}".format(key, self.filename)) from None
+
+        figure = _decode_figure(*_read_record(self.filename, offset), reformat=reformat)
+        axes = figure.get_axes()
+
+        return figure, axes[0] if axes else None
+
+    def figures(self, keys = None, reformat : bool = True):
+        '''Iterate over the figures of the archive, loading one figure at a time.
+
+        Parameters
+        ----------
+        keys : list, optional
+            Keys of the figures. (default value is None, which iterates over all figures)
+        reformat : bool, optional
+            If `True` the saved formatter is applied to each figure. (default value is `True`)
+
+        Yields
+        ------
+        key : str
+            Key of the figure.
+        figure : matplotlib.figure.Figure
+            Loaded `Figure` object.
+        '''
+        for key in (self.keys() if keys is None else keys):
+            yield key, self.load(key, reformat=reformat)[0]
+
+    def builders(self, keys = None, reformat : bool = True) -> list:
+        '''Figure builders for `write_many` and `format_many`.
+
+        Each builder loads a single figure from the archive in the worker process, so only the
+        file name and key are sent to the workers.
+
+        Parameters
+        ----------
+        keys : list, optional
+            Keys of the figures. (default value is None, which uses all figures)
+        reformat : bool, optional
+            If `True` the saved formatter is applied to each figure. (default value is `True`)
+
+        Returns
+        -------
+        builders : list
+            Picklable callables returning a `(Figure, Axes)` tuple.
+        '''
+        return [partial(_load_archived, str(self.filename), key, reformat)
+                for key in (self.keys() if keys is None else keys)]
@@ -0,0 +1,151 @@
+'''
+Utilities to write figures in the background while the calling process keeps running.
+'''
+
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .batch import _close_figure, _resolve_workers
+from .write import write_pdf
+
+
+def _write_pickled(payload, filepath, writer):
+
+    # Runs in the worker process. Figures created by pyplot are registered with pyplot again when
+    # unpickled, so they are closed once written
+    # =============================================================================================
+    figure = pickle.loads(payload)
+    try:
+        writer(figure, filepath)
+    finally:
+        _close_figure(figure)
+
+    return filepath
+
+
+class BackgroundWriter():
+    '''Write figures from a bounded pool of worker processes.
+
+    Figures are copied when they are submitted, so they can be modified or reused straight away.
+    Submitted figures are closed in the calling process once they are written. If `max_queue`
+    figures are waiting to be written, `submit` blocks until one of them is done.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes. (default value is None, which uses the number of CPUs)
+    max_queue : int, optional
+        Maximum number of figures submitted and not yet written. (default value is None, which
+        uses twice the number of workers)
+    writer : callable, optional
+        Function used to write each figure with the signature `writer(figure, filepath)`. It must
+        be picklable, e.g. a module level function. (default value is `write_pdf`)
+
+    Examples
+    --------
+    >>> with BackgroundWriter(workers=4) as background:
+    ...     for step in range(n_steps):
+    ...         fig = plot_step(step)
+    ...         background.submit(fig, "step_{}".format(step))
+    '''
+
+    def __init__(self, workers : int = None, max_queue : int = None, writer = write_pdf) -> None:
+        workers = _resolve_workers(workers, float("inf"))
+        if max_queue is None:
+            max_queue = 2*workers
+        if max_queue < 1:
+            raise ValueError("Maximum queue size must be at least 1, got {}".format(max_queue))
+
+        self.workers = workers
+        self.max_queue = max_queue
+        self.writer = writer
+
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._pending = {}
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return "BackgroundWriter(workers={}, max_queue={}, pending={})".format(
+            self.workers, self.max_queue, len(self._pending))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, figure, filepath, timeout : float = None):
+        '''Queue a figure to be written.
+
+        Parameters
+        ----------
+        figure : matplotlib.figure.Figure
+            Figure to be written.
+        filepath : str
+            Name of the output file, passed to the writer.
+        timeout : float, optional
+            Maximum time in seconds to wait for a free slot when the queue is full. (default value
+            is None, which waits until a slot is free)
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Future of the write. Its result is the output file path, or the exception raised by
+            the writer.
+        '''
+        if self._closed:
+            raise RuntimeError("Figures cannot be submitted to a closed BackgroundWriter")
+
+        self._close_written()
+        if not self._slots.acquire(timeout=timeout): # pylint: disable=consider-using-with
+            raise TimeoutError("BackgroundWriter queue is full ({} figures)"
+                               .format(self.max_queue))
+
+        try:
+            payload = pickle.dumps(figure)
+            future = self._executor.submit(_write_pickled, payload, filepath, self.writer)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending[future] = figure
+
+        return future
+
+    def _close_written(self) -> None:
+
+        # Figures are closed here rather than in the future callbacks, which run in another
+        # thread, because pyplot is not thread safe
+        # =========================================================================================
+        for future in [f for f in self._pending if f.done()]:
+            _close_figure(self._pending.pop(future))
+
+    def flush(self, timeout : float = None) -> list:
+        '''Wait until all submitted figures are written.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait. (default value is None, which waits for all figures)
+
+        Returns
+        -------
+        futures : list
+            Futures of the figures that are not written yet. Empty unless the timeout expired.
+        '''
+        _, not_done = wait(list(self._pending), timeout=timeout)
+        self._close_written()
+
+        return list(not_done)
+
+    def close(self) -> None:
+        '''Write all submitted figures and stop the worker processes.'''
+        if self._closed:
+            return
+
+        self.flush()
+        self._executor.shutdown()
+        self._closed = True
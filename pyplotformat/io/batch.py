@@ -0,0 +1,161 @@
+'''
+Utilities to format and write many figures across a pool of worker processes.
+'''
+
+import os
+import sys
+
+from .write import write_pdf
+
+
+class BatchResult():
+    '''Result of a single figure in a batch.
+
+    Attributes
+    ----------
+    index : int
+        Position of the figure in the batch input.
+    result : object
+        Value returned for the figure. This is the output file path for written figures or the
+        formatted `Figure` object otherwise. `None` if the figure failed.
+    error : Exception
+        Exception raised while processing the figure. `None` if the figure succeeded.
+    '''
+    # pylint: disable=too-few-public-methods
+    # This class format is just for data storage
+
+    def __init__(self, index, result=None, error=None):
+        self.index = index
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        if self.error is None:
+            return "BatchResult(index={}, result={!r})".format(self.index, self.result)
+        return "BatchResult(index={}, error={!r})".format(self.index, self.error)
+
+    @property
+    def ok(self) -> bool:
+        '''True if the figure was processed without error.'''
+        return self.error is None
+
+
+def _close_figure(figure) -> None:
+
+    # Only pyplot keeps a reference to figures, so there is nothing to close without it
+    # =============================================================================================
+    if "matplotlib.pyplot" in sys.modules:
+        sys.modules["matplotlib.pyplot"].close(figure)
+
+
+def _build_figure(figure):
+
+    # Figure builders are called to create the figure. Builders may return (Figure, Axes)
+    # =============================================================================================
+    if callable(figure):
+        figure = figure()
+        if isinstance(figure, tuple):
+            figure = figure[0]
+        return figure, True
+
+    return figure, False
+
+
+def _resolve_workers(workers, n_jobs) -> int:
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1, got {}".format(workers))
+
+    return max(min(workers, n_jobs), 1)
+
+
+def _call_job(function, args) -> tuple:
+
+    # Errors are returned rather than raised so one failed figure does not stop the batch
+    # =============================================================================================
+    try:
+        return function(*args), None
+    except Exception as err: # pylint: disable=broad-except
+        return None, err
+
+
+def _run_batch(function, jobs, workers=None) -> list[BatchResult]:
+
+    # Run function(*job, pooled) for each job, in a process pool if more than one worker is used
+    # =============================================================================================
+    jobs = list(jobs)
+    workers = _resolve_workers(workers, len(jobs))
+
+    if workers == 1:
+        return [BatchResult(ii, *_call_job(function, job + (False,)))
+                for ii, job in enumerate(jobs)]
+
+    # The process pool is only loaded when it is used
+    from concurrent.futures import ProcessPoolExecutor # pylint: disable=import-outside-toplevel
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_call_job, function, job + (True,)) for job in jobs]
+        for ii, future in enumerate(futures):
+            try:
+                results.append(BatchResult(ii, *future.result()))
+            except Exception as err: # pylint: disable=broad-except
+                # Raised when the job cannot be sent to or returned from the worker
+                results.append(BatchResult(ii, error=err))
+
+    return results
+
+
+def _write_job(figure, filepath, writer, pooled):
+
+    figure, built = _build_figure(figure)
+    try:
+        writer(figure, filepath)
+    finally:
+        if built or pooled:
+            _close_figure(figure)
+
+    return filepath
+
+
+def write_many( figures,
+                filepaths,
+                workers : int = None,
+                writer = write_pdf
+            ) -> list[BatchResult]:
+    '''Write many figures across a pool of worker processes.
+
+    Each figure is written independently. A figure that fails does not stop the batch, its error
+    is returned in the corresponding `BatchResult`.
+
+    Parameters
+    ----------
+    figures : list
+        Matplotlib `Figure` objects or figure builders. A builder is a picklable callable (e.g. a
+        module level function or `functools.partial`) that takes no arguments and returns a
+        `Figure` or a `(Figure, Axes)` tuple. Builders are called in the worker process and the
+        figure is closed once written.
+    filepaths : list
+        Name of the output file for each figure.
+    workers : int, optional
+        Number of worker processes. If 1 the figures are written in the calling process. (default
+        value is None, which uses the number of CPUs)
+    writer : callable, optional
+        Function used to write each figure with the signature `writer(figure, filepath)`.
+        (default value is `write_pdf`)
+
+    Returns
+    -------
+    results : list
+        `BatchResult` for each figure in input order. `result` is the output file path.
+    '''
+    figures = list(figures)
+    filepaths = list(filepaths)
+    if len(figures) != len(filepaths):
+        raise ValueError("Length of filepaths should be equal to the number of figures")
+
+    jobs = [(fig, path, writer) for fig, path in zip(figures, filepaths)]
+
+    return _run_batch(_write_job, jobs, workers)
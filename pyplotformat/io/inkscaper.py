@@ -2,12 +2,14 @@
 Utilities to integrate inkscape modifications into the loop of figure design.
 '''
 
-from .write import write_pdf
-
-from pathlib import Path
-from pypdf import PdfMerger
+import os
 import subprocess
-from datetime import datetime
+import tempfile
+from pathlib import Path
+
+from matplotlib.backends.backend_pdf import PdfPages
+
+from .write import write_pdf
 
 def inkscape(figures):
 
@@ -15,42 +17,28 @@ def inkscape(figures):
 
     try:
         subprocess.run(["inkscape", tmpname])
-    except Exception as e:
+    finally:
         Path(tmpname).unlink()
-        raise
-
-    Path(tmpname).unlink()
 
 
-def _write_figure_package(figures):
+def _write_figure_package(figures, directory=None):
 
+    # Write all figures as the pages of a single PDF in one pass. The file name is unique, so
+    # concurrent calls do not collide
+    # =============================================================================================
     try:
         iter(figures)
-    except:
+    except TypeError:
         figures = [figures]
 
-    tmpname = "." + datetime.now().strftime("%Y%m%d%H%M%S") + "_tmp"
-
-    pdfs = []
-
-    for ii, fig in enumerate(figures):
-
-        fname = tmpname + "_{}.pdf".format(ii)
-        pdfs.append(fname)
-        write_pdf(fig, fname)
-
-    merger = PdfMerger()
-
-    for pdf in pdfs:
-        merger.append(pdf)
-        Path(pdf).unlink()
-
-    merger.write(Path(tmpname).with_suffix(".pdf"))
-    merger.close()
-
-    return str(Path(tmpname).with_suffix(".pdf"))
-
-
-
+    fd, tmpname = tempfile.mkstemp(prefix="pyplotformat_", suffix=".pdf", dir=directory)
 
+    try:
+        with os.fdopen(fd, "wb") as out_file, PdfPages(out_file) as pdf:
+            for fig in figures:
+                write_pdf(fig, pdf)
+    except BaseException:
+        Path(tmpname).unlink()
+        raise
 
+    return tmpname
@@ -1,18 +1,32 @@
 '''
-Utilities to save and load figures through the use of Pickle. These figures
-can then be reformatted at a later date.
+Utilities to save and load figures. Figures are stored as compact data-only archives (see
+`pyplotformat.io.archive`) and can be reformatted at a later date.
 '''
 
 import pickle
 from pathlib import Path
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.axes import Axes
 
-def save_figure(filename: str, figure: plt.Figure, axes: plt.Axes) -> None:
+from .archive import FigureArchive, _decode_figure, _is_record, _read_record, _write_record
+
+def save_figure(filename: str, figure: Figure, axes: Axes = None, key: str = None) -> None:
     '''Save a figure for later use or formatting.
-    
-    Save a figure to a .fig extension. This figure contains the line data and
-    formatting data of the plot. Resulting figure can be loaded later with 
-    `loadFigure()`.
+
+    Save a figure to a .fig extension. This figure contains the line and collection data of the
+    plot and the options of the last formatter applied to it. Resulting figure can be loaded later
+    with `load_figure()`.
+
+    Only lines and collections (e.g. scatter, fill_between) are saved. Other artists, such as
+    images and patches, are skipped with a warning.
+
+    Lines reduced by the decimation stage of a formatter are saved with their full data, which
+    is decimated again when the figure is loaded and formatted. Line markers given as names,
+    codes, polygon tuples, vertices or paths are saved, other markers raise a `ValueError`.
+
+    If `key` is given the figure is appended to the .figs archive `filename` instead (see
+    `FigureArchive`). When saving many figures to an archive, use a `FigureArchive` directly so
+    the archive index is only written once.
 
     Parameters
     ----------
@@ -20,35 +34,73 @@ def save_figure(filename: str, figure: plt.Figure, axes: plt.Axes) -> None:
         Name of the file to write to. Does not require an extension.
     figure : matplotlib.pyplot.Figure
         Matplotlib `Figure` object to be saved.
-    axes : matplotlib.pyplot.Axes
-        Matplotlig `Axes` object to be saved.
+    axes : matplotlib.pyplot.Axes, optional
+        Matplotlib `Axes` object of the figure. Kept for compatibility, all axes of the figure are
+        saved.
+    key : str, optional
+        Key of the figure in a .figs archive. (default value is None, which saves a single .fig
+        file)
     '''
+    # pylint: disable=unused-argument
+    if key is not None:
+        with FigureArchive(filename, mode="a") as archive:
+            archive.append(key, figure)
+        return
+
     with open(Path(filename).with_suffix(".fig"), "wb") as out_file:
-        pickle.dump((figure, axes), out_file)
+        _write_record(out_file, figure)
 
-def load_figure(filename) -> tuple[plt.Figure, plt.Axes]:
+def load_figure(filename, reformat: bool = True, key: str = None,
+                allow_pickle: bool = False) -> tuple[Figure, Axes]:
     '''Load a saved figure for formatting and printing.
 
-    Load a figure from a previously saved figure generated with the `saveFigure()`
-    function. **WARNING**: The save method uses `pickle` to save files. The `pickle`
-    method is not secure. Only load files from trusted sources!
+    Load a figure from a previously saved figure generated with the `save_figure()`
+    function. The figure is rebuilt from the saved data and, if it was formatted before it was
+    saved, the formatter is applied again with the same options.
+
+    Line data is memory-mapped from the file, so it is only read from disk when the figure is
+    drawn. The file must not be modified or deleted while the figure is in use.
 
     Parameters
     ----------
     filename : str
         Name of the .fig file to be loaded.
+    reformat : bool, optional
+        If `True` the saved formatter is applied to the loaded figure. (default value is `True`)
+    key : str, optional
+        Key of the figure in the .figs archive `filename`. Only that figure is read from the
+        archive. (default value is None, which loads a single .fig file)
+    allow_pickle : bool, optional
+        If `True` files written by earlier versions of pyPlotFormat, which use `pickle`, are also
+        loaded. (default value is `False`, which raises a `ValueError` for such files)
 
     Warning
     -------
-    The save method uses `pickle` to save files. The `pickle` method is not secure
-    and files can be maliciously altered to run code. Only load files from trusted sources!
-    More details can be found at https://docs.python.org/3/library/pickle.html.
-    
+    The `pickle` method used by files written by earlier versions of pyPlotFormat is not secure
+    and files can be maliciously altered to run code. Only use `allow_pickle=True` for files from
+    trusted sources! More details can be found at https://docs.python.org/3/library/pickle.html.
+
     Returns
     -------
     figure : matplotlib.pyplot.Figure
         Saved `Figure` object
     axes : matplotlib.pyplot.Axes
-        Saved `Axes` object
+        First `Axes` object of the figure
     '''
-    return pickle.load( open(Path(filename).with_suffix(".fig"), "rb") )
+    if key is not None:
+        return FigureArchive(filename).load(key, reformat=reformat)
+
+    filename = Path(filename).with_suffix(".fig")
+
+    if not _is_record(filename):
+        if not allow_pickle:
+            raise ValueError("{} is not a figure record. Files written by earlier versions of "
+                             "pyPlotFormat use pickle and are only loaded with allow_pickle=True, "
+                             "which can run code from the file".format(filename))
+        with open(filename, "rb") as in_file:
+            return pickle.load(in_file)
+
+    figure = _decode_figure(*_read_record(filename), reformat=reformat)
+    axes = figure.get_axes()
+
+    return figure, axes[0] if axes else None
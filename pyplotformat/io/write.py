@@ -3,12 +3,21 @@ Utilities to produce image files from matplotlib figure objects.
 '''
 
 import os
+import time
 from pathlib import Path
-from matplotlib import pyplot as plt
+from matplotlib import rcParams
+from matplotlib.figure import Figure
 
+from .._state import peek_state
 
-def write_pdf(  figure : plt.Figure,
+# Formats in which only rasterized artists are drawn at the output dpi
+_VECTOR_FORMATS = ("pdf", "svg", "svgz", "eps", "ps")
+
+
+def write_pdf(  figure : Figure,
                 filepath : str,
+                stats = None,
+                layout : str = None
             ) -> None:
     '''Write formatted figure objects directly to PDF files.
     
@@ -18,17 +27,28 @@ def write_pdf(  figure : plt.Figure,
     ----------
     figure : matplotlib.pyplot.Figure
         Matplotlib `Figure` object containing a single axes with data plotted.
-    filepath : str
-        Name of the file for the figure .pdf. Extension is not required.
+    filepath : str or file-like
+        Name of the file for the figure .pdf. Extension is not required. A binary file object or a
+        `matplotlib.backends.backend_pdf.PdfPages` object, to which the figure is added as a page,
+        are also accepted.
+    stats : FormatStats, optional
+        If given, the wall time of `savefig` is added to the stats as the 'savefig' stage.
+    layout : str, optional
+        'fixed' writes the figure at its size in a single draw, 'tight' crops the page to the
+        tight bounding box of the figure. (default value is None, which uses 'fixed' for figures
+        formatted with a fixed layout and 'tight' otherwise)
     '''
 
-    fname = Path(filepath).with_suffix(".pdf")
+    if isinstance(filepath, (str, os.PathLike)):
+        filepath = Path(filepath).with_suffix(".pdf")
 
-    figure.savefig(fname, dpi='figure', bbox_inches="tight")
+    _savefig(figure, filepath, stats, fmt="pdf", layout=layout)
 
 
-def write_svg(  figure : plt.Figure,
+def write_svg(  figure : Figure,
                 filepath : str,
+                stats = None,
+                layout : str = None
             ) -> None:
     '''Write formatted figure objects directly to SVG files.
     
@@ -40,8 +60,135 @@ def write_svg(  figure : plt.Figure,
         Matplotlib `Figure` object containing a single axes with data plotted.
     filepath : str
         Name of the file for the figure .svg. Extension is not required.
+    stats : FormatStats, optional
+        If given, the wall time of `savefig` is added to the stats as the 'savefig' stage.
+    layout : str, optional
+        'fixed' writes the figure at its size in a single draw, 'tight' crops the page to the
+        tight bounding box of the figure. (default value is None, which uses 'fixed' for figures
+        formatted with a fixed layout and 'tight' otherwise)
     '''
 
     fname = Path(filepath).with_suffix(".svg")
 
-    figure.savefig(fname, dpi='figure', bbox_inches="tight")
+    _savefig(figure, fname, stats, layout=layout)
+
+
+def _resolve_layout(figure, layout) -> str:
+
+    # Figures formatted with a fixed layout are written at their size, others are cropped
+    # =============================================================================================
+    if layout is None:
+        layout = peek_state(figure).get("layout", "tight")
+    if layout not in ("fixed", "tight"):
+        raise ValueError("Layout '{}' not recognized. Options are fixed, tight".format(layout))
+
+    return layout
+
+
+def _resolve_dpi(figure, fname, fmt, dpi):
+
+    # Only rasterized artists are affected by the dpi of vector output, so vector formats use
+    # the raster dpi of the figure shape when formatted with a rasterization threshold
+    # =============================================================================================
+    if fmt is None and isinstance(fname, (str, os.PathLike)):
+        fmt = Path(fname).suffix[1:]
+    if dpi == 'figure' and str(fmt).lower() in _VECTOR_FORMATS:
+        return peek_state(figure).get("raster_dpi", dpi)
+
+    return dpi
+
+
+def _tight_bbox(figure):
+
+    # Tight bounding box in inches, measured once so it can be shared by several writes
+    # =============================================================================================
+    from ..plot.textmetrics import cached_renderer # pylint: disable=import-outside-toplevel
+
+    renderer = cached_renderer(figure._get_renderer()) # pylint: disable=protected-access
+    bbox = figure.get_tightbbox(renderer)
+
+    return bbox.padded(rcParams["savefig.pad_inches"])
+
+
+def _savefig(figure, fname, stats=None, fmt=None, layout=None, dpi='figure', bbox=None) -> None:
+
+    # A fixed layout is written with a single draw, a tight bounding box needs an extra draw to
+    # measure the figure unless it is given
+    # =============================================================================================
+    if bbox is None and _resolve_layout(figure, layout) == "tight":
+        bbox = "tight"
+    extra = {} if bbox is None else {"bbox_inches": bbox}
+
+    start = time.perf_counter()
+    figure.savefig(fname, format=fmt, dpi=_resolve_dpi(figure, fname, fmt, dpi), **extra)
+    if stats is not None:
+        stats.add("savefig", time.perf_counter() - start)
+
+
+def _write_format_job(figure, fname, fmt, bbox, dpi, pooled):
+
+    # pylint: disable=unused-argument
+    _savefig(figure, fname, fmt=fmt, dpi=dpi, bbox=bbox)
+
+    return str(fname)
+
+
+def write_figure(   figure : Figure,
+                    filepath : str,
+                    formats = ("pdf", "svg", "png"),
+                    workers : int = 1,
+                    dpi = 'figure',
+                    stats = None,
+                    layout : str = None
+                ) -> list:
+    '''Write a figure to several file formats from a single layout.
+
+    The layout is resolved once for all formats. Figures with a fixed layout are written at their
+    size, otherwise the tight bounding box is measured once and shared by every format, instead of
+    being measured again for each file.
+
+    Parameters
+    ----------
+    figure : matplotlib.pyplot.Figure
+        Matplotlib `Figure` object with data plotted.
+    filepath : str
+        Name of the output files. The extension of each format is added.
+    formats : list, optional
+        File formats supported by `savefig`, e.g. 'pdf', 'svg' and 'png'. (default value is
+        ('pdf', 'svg', 'png'))
+    workers : int, optional
+        Number of worker processes writing the formats concurrently. If 1 the formats are written
+        in the calling process. (default value is 1)
+    dpi : float, optional
+        Resolution of raster formats such as 'png'. (default value is 'figure', which uses the
+        figure dpi, and the raster dpi of the figure shape for the rasterized artists of vector
+        formats if the figure was formatted with `rasterize`)
+    stats : FormatStats, optional
+        If given, the wall time of writing all formats is added to the stats as the 'savefig'
+        stage.
+    layout : str, optional
+        'fixed' writes the figure at its size in a single draw, 'tight' crops the page to the
+        tight bounding box of the figure. (default value is None, which uses 'fixed' for figures
+        formatted with a fixed layout and 'tight' otherwise)
+
+    Returns
+    -------
+    filepaths : list
+        Name of the file written for each format.
+    '''
+    from .batch import _run_batch # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+
+    bbox = _tight_bbox(figure) if _resolve_layout(figure, layout) == "tight" else None
+    jobs = [(figure, Path(filepath).with_suffix("." + fmt), fmt, bbox, dpi) for fmt in formats]
+
+    results = _run_batch(_write_format_job, jobs, workers)
+    for result in results:
+        if not result.ok:
+            raise result.error
+
+    if stats is not None:
+        stats.add("savefig", time.perf_counter() - start)
+
+    return [result.result for result in results]
@@ -5,3 +5,4 @@ This subpackage contains the plotting modules for the pyPlotFormat package.
 from .plot_2d import Format2D
 from .plot_polar import FormatPolar
 from .legend import FormatLegend
+from .stats import FormatStats
@@ -0,0 +1,92 @@
+'''
+This module contains the placement engine for line annotations (short labels).
+
+Labels are placed in a single column on the right margin of the axes. Overlapping labels are
+resolved with a sorted sweep that merges colliding labels into clusters, each centred on the mean
+of its target positions. All labels share one height, so no per-label text measurement is needed
+and the sweep is O(n log n) in the number of labels.
+'''
+
+import numpy as np
+
+
+def place_labels(targets, height, lower=None, upper=None) -> np.ndarray:
+    '''Find non-overlapping positions for a column of labels.
+
+    Parameters
+    ----------
+    targets : array_like
+        Preferred centre position of each label.
+    height : float
+        Height of each label, in the same units as `targets`.
+    lower : float, optional
+        Lowest allowed label centre. (default value is None, unbounded)
+    upper : float, optional
+        Highest allowed label centre. (default value is None, unbounded)
+
+    Returns
+    -------
+    positions : numpy.ndarray
+        Centre position of each label in the order of `targets`. Labels are at least `height`
+        apart and keep the order of their targets.
+    '''
+    targets = np.asarray(targets, dtype=float)
+    n = targets.size
+    if n == 0:
+        return targets.copy()
+
+    # Bounds are ignored if the labels cannot fit between them
+    if lower is not None and upper is not None and (n - 1)*height > upper - lower:
+        lower = upper = None
+
+    order = np.argsort(targets, kind="stable")
+    sorted_targets = targets[order]
+
+    # Each cluster is [count, sum of (target - k*height)], where k is the position in the cluster
+    counts = []
+    sums = []
+    starts = []
+
+    for target in sorted_targets:
+        count, total = 1, target
+        while True:
+            start = total/count
+            if lower is not None:
+                start = min(max(start, lower), upper - (count - 1)*height)
+            if not counts or starts[-1] + counts[-1]*height <= start:
+                break
+            # Merge with the previous cluster, shifting this cluster by its size
+            prev_count = counts.pop()
+            prev_total = sums.pop()
+            starts.pop()
+            total = prev_total + total - count*prev_count*height
+            count += prev_count
+        counts.append(count)
+        sums.append(total)
+        starts.append(start)
+
+    counts = np.asarray(counts)
+    offsets = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
+    placed = np.repeat(starts, counts) + offsets*height
+
+    positions = np.empty(n)
+    positions[order] = placed
+
+    return positions
+
+
+def last_finite(data) -> float:
+    '''Find the last finite value of a sequence, or nan if there is none.'''
+    try:
+        values = np.asarray(data, dtype=float).ravel()
+    except (TypeError, ValueError):
+        return np.nan
+
+    if values.size and np.isfinite(values[-1]):
+        return float(values[-1])
+
+    finite = np.flatnonzero(np.isfinite(values))
+    if finite.size == 0:
+        return np.nan
+
+    return float(values[finite[-1]])
@@ -0,0 +1,90 @@
+'''
+This module contains the line color assignment used by the format classes.
+
+Colors for all lines of an axes are found in a single vectorised pass. Lines without a color
+override take the next color of the palette in order, and the palette is repeated when there are
+more lines than palette colors.
+'''
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib import colors as mcolors
+
+from .default_values import _default_colors
+
+_BLACK = "#000000"
+
+
+def palette_colors(palette, n_colors) -> np.ndarray:
+    '''Get the colors of a palette.
+
+    Parameters
+    ----------
+    palette : str or list
+        Name of a matplotlib colormap, which is sampled at `n_colors` evenly spaced points, or a
+        list of colors, which is repeated as required.
+    n_colors : int
+        Number of colors.
+
+    Returns
+    -------
+    colors : numpy.ndarray
+        RGBA color of each line, shape (n_colors, 4).
+    '''
+    if isinstance(palette, str):
+        try:
+            cmap = colormaps[palette]
+        except KeyError:
+            raise ValueError("Palette '{}' is not a matplotlib colormap".format(palette)) from None
+        return cmap(np.linspace(0.0, 1.0, n_colors))
+
+    palette = mcolors.to_rgba_array(palette)
+    if len(palette) == 0:
+        raise ValueError("Palette must contain at least one color")
+
+    return palette[np.arange(n_colors) % len(palette)]
+
+
+def line_colors(n_lines, color=None, palette=None, blackline=False) -> np.ndarray:
+    '''Assign a color to each line of an axes.
+
+    Parameters
+    ----------
+    n_lines : int
+        Number of lines.
+    color : list, optional
+        Color override for each line. Lines with a `None` entry take the next palette color, so
+        the palette order is kept for the lines that are not overridden. (default value is None)
+    palette : str or list, optional
+        Name of a matplotlib colormap or a list of colors, see `palette_colors`. (default value is
+        None, which repeats the default colors)
+    blackline : bool, optional
+        If `True` lines that are not overridden are black. (default value is `False`)
+
+    Returns
+    -------
+    colors : numpy.ndarray
+        RGBA color of each line, shape (n_lines, 4).
+    '''
+    if color is None:
+        overridden = np.zeros(n_lines, dtype=bool)
+    else:
+        if len(color) != n_lines:
+            raise ValueError("Length of specified color array should be equal to number of lines "
+                             "in given matplotlib.pyplot.Axes object")
+        overridden = np.array([col is not None for col in color], dtype=bool)
+
+    if blackline:
+        palette = [_BLACK]
+    elif palette is None:
+        palette = _default_colors
+
+    # Lines that are not overridden take the palette colors in order
+    n_palette = int(n_lines - overridden.sum())
+
+    colors = np.empty((n_lines, 4))
+    colors[~overridden] = palette_colors(palette, n_palette) if n_palette else np.empty((0, 4))
+    if overridden.any():
+        colors[overridden] = mcolors.to_rgba_array([col for col in color if col is not None])
+
+    return colors
@@ -0,0 +1,90 @@
+'''
+This module contains the line consolidation methods used by the format classes.
+
+Figures such as parameter sweeps can hold thousands of `Line2D` artists that share a style. Each
+line is drawn with its own draw call and written as its own path. Consolidation draws all lines
+with the same style and label as a single `LineCollection` instead.
+
+The original lines are kept on the axes, hidden and with their label prefixed by an underscore,
+so formatting stages that read the lines still work and the lines can be restored. The collection
+takes the label of its lines, so legends show one entry per group.
+'''
+
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+# Label given to collections of unlabelled lines, hidden from legends
+_HIDDEN_LABEL = "_consolidated"
+
+
+def _style_key(line, axes):
+
+    # Only plain lines in data coordinates are consolidated. Markers and step drawstyles are drawn
+    # differently by a LineCollection
+    # =============================================================================================
+    if line.get_marker() not in ("None", None, "", " ") or line.get_drawstyle() != "default":
+        return None
+    if line.get_transform() is not axes.transData or not line.get_visible():
+        return None
+
+    # Unlabelled lines (e.g. '_child0') are grouped together
+    label = line.get_label()
+
+    return (to_rgba(line.get_color(), line.get_alpha()), line.get_linewidth(),
+            line.get_linestyle(), line.get_zorder(), line.get_clip_on(),
+            _HIDDEN_LABEL if label.startswith("_") else label)
+
+
+def consolidate_lines(axes, min_lines=2) -> dict:
+    '''Replace groups of lines with the same style and label by a `LineCollection`.
+
+    Parameters
+    ----------
+    axes : matplotlib.axes.Axes
+        Axes containing the lines.
+    min_lines : int, optional
+        Minimum number of lines in a group for it to be consolidated. (default value is 2)
+
+    Returns
+    -------
+    hidden : dict
+        Original label of each line hidden by the consolidation, see `restore_lines`.
+    '''
+    groups = {}
+    for line in axes.get_lines():
+        key = _style_key(line, axes)
+        if key is not None:
+            groups.setdefault(key, []).append(line)
+
+    hidden = {}
+    for (color, linewidth, linestyle, zorder, clip_on, label), lines in groups.items():
+        if len(lines) < min_lines:
+            continue
+
+        collection = LineCollection([line.get_xydata() for line in lines], colors=[color],
+                                    linewidths=linewidth, linestyles=linestyle, zorder=zorder,
+                                    label=label)
+        collection.set_clip_on(clip_on)
+        axes.add_collection(collection, autolim=False)
+
+        for line in lines:
+            hidden[line] = line.get_label()
+            line.set_visible(False)
+            line.set_label("_" + hidden[line])
+
+    return hidden
+
+
+def restore_lines(hidden) -> None:
+    '''Show the lines hidden by `consolidate_lines` again with their original labels.
+
+    The collections added by the consolidation must be removed separately.
+
+    Parameters
+    ----------
+    hidden : dict
+        Original label of each hidden line, as returned by `consolidate_lines`.
+    '''
+    for line, label in hidden.items():
+        line.set_visible(True)
+        line.set_label(label)
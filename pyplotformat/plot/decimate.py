@@ -0,0 +1,272 @@
+'''
+This module contains the line decimation methods used to reduce lines to the resolution that can
+be shown at the physical size of the figure.
+
+Two methods are available:
+
+- 'minmax' keeps the first, minimum, maximum and last point of every pixel column. The envelope
+  of the line is preserved exactly, so the result is indistinguishable from the full data at the
+  target resolution.
+- 'lttb' (Largest-Triangle-Three-Buckets) keeps one point per bucket, chosen to preserve the
+  visual shape of the line. It produces fewer points than 'minmax' but may clip narrow peaks.
+
+Lines are binned across the view of their axes in scaled coordinates, so log axes and zoomed
+views keep the resolution of every visible pixel column. Points outside the view are reduced to
+their first, last, minimum and maximum point on each side, which keeps the data extent of the
+line. The original data of each decimated line is kept, so decimation can be undone with
+`restore_line` or repeated when the view changes.
+'''
+
+import weakref
+
+import numpy as np
+
+# Original data of decimated lines
+_original_data = weakref.WeakKeyDictionary()
+
+
+def _run_starts(mask) -> np.ndarray:
+
+    # Index of the first element of each run of True values
+    # =============================================================================================
+    return np.flatnonzero(mask & ~np.concatenate(([False], mask[:-1])))
+
+
+def _first_per_bin(indices, bins) -> np.ndarray:
+
+    # Keep the first index of each bin from an ascending list of indices
+    # =============================================================================================
+    if indices.size == 0:
+        return indices
+    b = bins[indices]
+    return indices[np.concatenate(([True], b[1:] != b[:-1]))]
+
+
+def _column_bins(x, n_bins, view) -> np.ndarray:
+
+    # Column of each point. Points before and after the view (or non-finite, e.g. non-positive
+    # values on a log axis, which can only come first) are put in one extra column on each side
+    # =============================================================================================
+    lower, upper = view
+    columns = np.floor((x - lower)*(n_bins/(upper - lower)))
+    columns = np.clip(np.nan_to_num(columns, nan=-1.0), -1, n_bins - 1).astype(np.intp)
+    columns[x > upper] = n_bins
+
+    return columns
+
+
+def minmax_decimate(x, y, n_bins, view=None) -> np.ndarray:
+    '''Find the points of a line required to draw its min/max envelope.
+
+    The x range of the view is split into `n_bins` equal columns. The first, last, minimum and
+    maximum point of each column is kept. Points outside the view are treated as one extra column
+    on each side. Non-finite y values are kept at the start of each gap so that breaks in the line
+    are preserved.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Monotonically increasing x data of the line, in the scaled coordinates of the axis (e.g.
+        log10 of the data on a log axis).
+    y : numpy.ndarray
+        y data of the line.
+    n_bins : int
+        Number of columns, normally the number of device pixels across the axes.
+    view : tuple, optional
+        Lower and upper x limit of the columns in the same coordinates as `x`. (default value is
+        None, which uses the range of `x`)
+
+    Returns
+    -------
+    index : numpy.ndarray
+        Sorted indices of the points to keep.
+    '''
+    n = x.size
+    if view is None:
+        view = (x[0], x[-1])
+    if n <= 4*n_bins or not view[1] - view[0] > 0:
+        return np.arange(n)
+
+    bins = _column_bins(x, n_bins, view)
+    starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1])))
+    ends = np.concatenate((starts[1:], [n])) - 1
+
+    # Per-bin minimum and maximum, ignoring nan
+    finite = np.isfinite(y)
+    ymin = np.fmin.reduceat(np.where(finite, y, np.inf), starts)
+    ymax = np.fmax.reduceat(np.where(finite, y, -np.inf), starts)
+    counts = np.diff(np.concatenate((starts, [n])))
+    ymin = np.repeat(ymin, counts)
+    ymax = np.repeat(ymax, counts)
+
+    keep = np.concatenate((
+        starts,
+        ends,
+        _first_per_bin(np.flatnonzero(finite & (y == ymin)), bins),
+        _first_per_bin(np.flatnonzero(finite & (y == ymax)), bins),
+        _run_starts(~finite),
+    ))
+
+    return np.unique(keep)
+
+
+def lttb_decimate(x, y, n_out) -> np.ndarray:
+    '''Find the points of a line selected by the Largest-Triangle-Three-Buckets method.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Monotonically increasing x data of the line. Must be finite.
+    y : numpy.ndarray
+        y data of the line. Must be finite.
+    n_out : int
+        Number of points to keep.
+
+    Returns
+    -------
+    index : numpy.ndarray
+        Sorted indices of the points to keep.
+    '''
+    n = x.size
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges for the interior points, the first and last point are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    # Average point of each bucket, used as the third vertex of the triangle
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x/counts, x[-1])
+    avg_y = np.append(sums_y/counts, y[-1])
+
+    prev = 0
+    for ii in range(n_out - 2):
+        lo, hi = edges[ii], edges[ii + 1]
+        area = np.abs((x[prev] - avg_x[ii + 1])*(y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi])*(avg_y[ii + 1] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        keep[ii + 1] = prev
+
+    return keep
+
+
+def _lttb_in_view(x, y, n_out, view) -> np.ndarray:
+
+    # LTTB for the points inside the view, the points on each side of the view are reduced to the
+    # columns kept by minmax_decimate
+    # =============================================================================================
+    lo, hi = np.searchsorted(x, view[0]), np.searchsorted(x, view[1], side="right")
+    outside = minmax_decimate(x, y, 1, view)
+    outside = outside[(outside < lo) | (outside >= hi)]
+
+    return np.unique(np.concatenate((outside, lo + lttb_decimate(x[lo:hi], y[lo:hi], n_out))))
+
+
+def decimate_line(line, n_pixels, method="minmax") -> bool:
+    '''Reduce the data of a line to what can be shown across `n_pixels` device pixels.
+
+    Lines with markers, non-monotonic x data or too few points are left unchanged. The line is
+    binned across the view limits and scales of its axes, and the original data is kept so the
+    line can be restored with `restore_line`. A line that is already decimated is restored first.
+
+    Parameters
+    ----------
+    line : matplotlib.lines.Line2D
+        Line to decimate in place.
+    n_pixels : int
+        Number of device pixels across the axes.
+    method : str, {minmax, lttb}
+        Decimation method. (default value is 'minmax')
+
+    Returns
+    -------
+    decimated : bool
+        True if the data of the line was replaced.
+    '''
+    if method not in ("minmax", "lttb"):
+        raise ValueError("Decimation method '{}' not recognized. Options are 'minmax' and "
+                         "'lttb'".format(method))
+
+    restore_line(line)
+
+    if line.get_marker() not in (None, "None", "none", "", " "):
+        return False
+
+    try:
+        x = np.asarray(line.get_xdata(orig=False), dtype=float)
+        y = np.asarray(line.get_ydata(orig=False), dtype=float)
+    except (TypeError, ValueError):
+        return False
+
+    if x.ndim != 1 or x.size != y.size or x.size <= 4*n_pixels:
+        return False
+    if not np.all(np.diff(x) >= 0):
+        return False
+
+    # Bin in the scaled coordinates of the axes (e.g. log10 on a log axis) across the view
+    sx, sy, view = x, y, None
+    if line.axes is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sx = line.axes.xaxis.get_transform().transform(x)
+            sy = line.axes.yaxis.get_transform().transform(y)
+            view = tuple(np.sort(line.axes.xaxis.get_transform().transform(
+                np.asarray(line.axes.get_xlim(), dtype=float))))
+        if not np.all(np.isfinite(view)):
+            view = None
+
+    if method == "lttb" and np.all(np.isfinite(sx)) and np.all(np.isfinite(sy)):
+        index = _lttb_in_view(sx, sy, 2*n_pixels, view or (sx[0], sx[-1]))
+    else:
+        index = minmax_decimate(sx, y, n_pixels, view)
+
+    if index.size >= x.size:
+        return False
+
+    _original_data[line] = (line.get_xdata(orig=True), line.get_ydata(orig=True))
+    line.set_data(x[index], y[index])
+
+    return True
+
+
+def original_data(line) -> tuple:
+    '''Get the data of a line before it was reduced by `decimate_line`.
+
+    Parameters
+    ----------
+    line : matplotlib.lines.Line2D
+        Decimated or unchanged line.
+
+    Returns
+    -------
+    x, y : array_like
+        Original x and y data of a decimated line, otherwise the current data of the line.
+    '''
+    return _original_data.get(line) or (line.get_xdata(orig=True), line.get_ydata(orig=True))
+
+
+def restore_line(line) -> bool:
+    '''Restore the original data of a line reduced by `decimate_line`.
+
+    Parameters
+    ----------
+    line : matplotlib.lines.Line2D
+        Decimated line.
+
+    Returns
+    -------
+    restored : bool
+        True if the line was decimated and its data was restored.
+    '''
+    data = _original_data.pop(line, None)
+    if data is None:
+        return False
+
+    line.set_data(*data)
+
+    return True
@@ -10,16 +10,47 @@ _default_colors = [ '#e31a1c', '#1f78b4', '#33a02c',
 
 _MAX_LABEL_SIZE = 24
 
+_default_font_family = "Times New Roman"
+
+# Font size multiplier for each text role
+_font_role_scale = {    'default':  1.0,
+                        'axes':     1.0,
+                        'title':    1.2,
+                        'tick':     1.0,
+                        'legend':   1.0
+                        }
+
+# Figure sizes in inches (W x H) for each shape option
+_figure_sizes = {   'single':   (3.14961, 2.756),   # 8cm x 7cm
+                    'double':   (6.29921, 2.756),   # 16cm x 7cm
+                    'large':    (6.29921, 5.512)    # 16cm x 14cm
+                    }
+
+_fallback_figure_size = (3.14961, 3.14961)          # 8cm x 8cm
+
+# Resolution of rasterized artists for each shape option, about 3 million pixels per figure
+_raster_dpi = { 'single':   600,
+                'double':   400,
+                'large':    300
+                }
+
+_fallback_raster_dpi = 600
+
 
 _default_format_opts = {'xlabel':           None,
                         'ylabel':           None,
                         'title':            None,
                         'show':             False,
                         'color':            None,
+                        'palette':          None,
                         'shortlabel':       None,
                         'annotate':         False,
                         'blackline':        False,
-                        'ncol':             1
+                        'ncol':             None,
+                        'layout':           'tight',
+                        'rasterize':        None,
+                        'live':             False,
+                        'force':            False
                                                 }
 
 _default_2d_format_opts = _default_format_opts
@@ -33,7 +64,10 @@ _default_2d_format_opts.update({
                                     'yscale':       None,
                                     "grid":         True,
                                     "x_tick_loc":   None,
-                                    "y_tick_loc":   None
+                                    "y_tick_loc":   None,
+                                    "decimate":     None,
+                                    "decimate_dpi": 300,
+                                    "consolidate":  False
                                     })
 
 _default_polar_format_opts = _default_format_opts
@@ -0,0 +1,256 @@
+'''
+This module contains the data extent methods used by the format classes to set axis limits.
+
+The extent of each artist is found with a single vectorised pass over its data. Non-finite values
+(None, NaN and +/-inf) and masked values are ignored so that gaps in the data do not affect the
+axis limits.
+
+For live figures, where points are appended to the lines between calls, the running extent of
+each line is kept so only the new points are scanned.
+'''
+
+import weakref
+
+import numpy as np
+from matplotlib.collections import Collection
+from matplotlib.image import AxesImage
+from matplotlib.patches import Patch
+
+
+class Extent():
+    '''Running minimum and maximum of the x and y data of a set of artists.
+
+    Values are `nan` until finite data has been added.
+
+    Attributes
+    ----------
+    xmin : float
+        Minimum finite x value.
+    xmax : float
+        Maximum finite x value.
+    ymin : float
+        Minimum finite y value.
+    ymax : float
+        Maximum finite y value.
+    '''
+
+    def __init__(self) -> None:
+
+        self.xmin = np.nan
+        self.xmax = np.nan
+        self.ymin = np.nan
+        self.ymax = np.nan
+
+    def __repr__(self) -> str:
+
+        return "Extent(x=[{}, {}], y=[{}, {}])".format(self.xmin, self.xmax,
+                                                       self.ymin, self.ymax)
+
+    @property
+    def valid_x(self) -> bool:
+        '''True if finite x data has been added.'''
+        return not np.isnan(self.xmin)
+
+    @property
+    def valid_y(self) -> bool:
+        '''True if finite y data has been added.'''
+        return not np.isnan(self.ymin)
+
+    def update_x(self, data) -> None:
+        '''Extend the x range to include the finite values of `data`.'''
+        self.xmin, self.xmax = _merge_limits(self.xmin, self.xmax, _array_limits(data))
+
+    def update_y(self, data) -> None:
+        '''Extend the y range to include the finite values of `data`.'''
+        self.ymin, self.ymax = _merge_limits(self.ymin, self.ymax, _array_limits(data))
+
+    def update(self, other) -> None:
+        '''Extend this extent to include another `Extent`.'''
+        self.xmin, self.xmax = _merge_limits(self.xmin, self.xmax, (other.xmin, other.xmax))
+        self.ymin, self.ymax = _merge_limits(self.ymin, self.ymax, (other.ymin, other.ymax))
+
+
+def _as_float_array(data) -> np.ndarray:
+
+    # None entries become nan and masked entries are filled with nan
+    # =============================================================================================
+    if np.ma.isMaskedArray(data):
+        return np.ma.filled(data.astype(float, copy=False), np.nan).ravel()
+    return np.asarray(data, dtype=float).ravel()
+
+
+def _array_limits(data) -> tuple[float, float]:
+
+    # Minimum and maximum of the finite values, (nan, nan) if there are none
+    # =============================================================================================
+    try:
+        values = _as_float_array(data)
+    except (TypeError, ValueError):
+        return np.nan, np.nan
+
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return np.nan, np.nan
+
+    return float(finite.min()), float(finite.max())
+
+
+def _merge_limits(vmin, vmax, limits) -> tuple[float, float]:
+
+    # np.fmin/np.fmax ignore nan so an empty range never overrides a valid one
+    # =============================================================================================
+    return float(np.fmin(vmin, limits[0])), float(np.fmax(vmax, limits[1]))
+
+
+# Running extent of live lines, with the number of points already included
+_running_extents = weakref.WeakKeyDictionary()
+
+
+def _line_data(line, getter, start=0):
+
+    # The original data avoids a copy. Unit data (e.g. dates) falls back to the converted values.
+    # =============================================================================================
+    data = getter(orig=True)
+    try:
+        return _as_float_array(data[start:] if start else data)
+    except (TypeError, ValueError):
+        return getter(orig=False)[start:]
+
+
+def _data_components(artist, axes) -> tuple[bool, bool]:
+
+    # Lines such as axhline and axvline use a blended transform, with one coordinate in axes
+    # coordinates. Only the coordinates given in data coordinates affect the extent
+    # =============================================================================================
+    return artist.get_transform().contains_branch_seperately(axes.transData)
+
+
+def _line_extent(line, axes) -> Extent:
+
+    extent = Extent()
+    in_x, in_y = _data_components(line, axes)
+    if in_x:
+        extent.update_x(_line_data(line, line.get_xdata))
+    if in_y:
+        extent.update_y(_line_data(line, line.get_ydata))
+
+    return extent
+
+
+def _running_line_extent(line, axes) -> Extent:
+
+    # Only points appended since the last call are scanned. Lines that got shorter have been
+    # replaced rather than appended to, so they are scanned again
+    # =============================================================================================
+    count, extent = _running_extents.get(line, (0, None))
+    n_points = min(len(line.get_xdata(orig=True)), len(line.get_ydata(orig=True)))
+
+    if extent is None or n_points < count:
+        count, extent = 0, Extent()
+
+    extent.update_x(_line_data(line, line.get_xdata, count)[:n_points - count])
+    extent.update_y(_line_data(line, line.get_ydata, count)[:n_points - count])
+    _running_extents[line] = (n_points, extent)
+
+    # The running extent includes both coordinates, only the data coordinates are returned
+    in_x, in_y = _data_components(line, axes)
+    if in_x and in_y:
+        return extent
+
+    partial = Extent()
+    if in_x:
+        partial.xmin, partial.xmax = extent.xmin, extent.xmax
+    if in_y:
+        partial.ymin, partial.ymax = extent.ymin, extent.ymax
+
+    return partial
+
+
+def _vertices_extent(vertices) -> Extent:
+
+    extent = Extent()
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    extent.update_x(vertices[:, 0])
+    extent.update_y(vertices[:, 1])
+
+    return extent
+
+
+def _collection_extent(collection, axes) -> Extent:
+
+    # Scatter offsets and path vertices (LineCollection, fill_between PolyCollection) are only
+    # used when they are given in data coordinates.
+    # =============================================================================================
+    extent = Extent()
+
+    offsets = collection.get_offsets()
+    if len(offsets) and collection.get_offset_transform().contains_branch(axes.transData):
+        extent.update(_vertices_extent(offsets))
+
+    if collection.get_transform().contains_branch(axes.transData):
+        paths = collection.get_paths()
+        if paths:
+            extent.update(_vertices_extent(np.concatenate([path.vertices for path in paths])))
+
+    return extent
+
+
+def _image_extent(image) -> Extent:
+
+    extent = Extent()
+    left, right, bottom, top = image.get_extent()
+    extent.update_x([left, right])
+    extent.update_y([bottom, top])
+
+    return extent
+
+
+def _patch_extent(patch, axes) -> Extent:
+
+    if not patch.get_transform().contains_branch(axes.transData):
+        return Extent()
+
+    vertices = patch.get_patch_transform().transform(patch.get_path().vertices)
+
+    return _vertices_extent(vertices)
+
+
+def axes_extent(axes, running : bool = False) -> Extent:
+    '''Find the extent of all data plotted on an axes.
+
+    Lines, collections (scatter, LineCollection, fill_between), images and patches are all
+    included. Each artist is reduced with a single vectorised pass over its data. Coordinates of
+    artists that are not in data coordinates (e.g. the x coordinates of an `axhline`) are ignored.
+
+    Parameters
+    ----------
+    axes : matplotlib.axes.Axes
+        Axes containing the plotted data.
+    running : bool, optional
+        If `True` the extent of each line is kept between calls and only points appended to the
+        line since the last call are scanned. Points already scanned must not be modified.
+        (default value is `False`)
+
+    Returns
+    -------
+    extent : Extent
+        Combined extent of all artists. Limits are `nan` if there is no finite data.
+    '''
+    extent = Extent()
+
+    for line in axes.get_lines():
+        extent.update(_running_line_extent(line, axes) if running else _line_extent(line, axes))
+
+    for collection in axes.collections:
+        if isinstance(collection, Collection):
+            extent.update(_collection_extent(collection, axes))
+
+    for image in axes.get_images():
+        if isinstance(image, AxesImage):
+            extent.update(_image_extent(image))
+
+    for patch in axes.patches:
+        if isinstance(patch, Patch):
+            extent.update(_patch_extent(patch, axes))
+
+    return extent
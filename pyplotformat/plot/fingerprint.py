@@ -0,0 +1,119 @@
+'''
+This module contains the fingerprint methods used to skip formatting stages that have already been
+applied to a figure with the same options and data.
+
+Each stage declares the kwargs it reads, whether it reads the plotted data and which earlier
+stages it depends on. The digest of a stage combines these with the formatter settings, so a
+stage is only re-applied when one of its inputs has changed.
+
+The data signature checksums every value (and the mask of masked arrays) of each line, so in-place
+edits of single points are detected. The crc32 checksum runs at memory speed and the data is not
+copied when it is already a contiguous array.
+'''
+
+import hashlib
+import zlib
+
+import numpy as np
+
+
+def _array_bytes(data) -> bytes:
+
+    # Dtype, length and checksum of the whole buffer of an array, and of its mask if it has one
+    # =============================================================================================
+    values = np.asarray(np.ma.getdata(data))
+    if values.dtype == object:
+        return repr(values.tolist()).encode()
+
+    values = np.ascontiguousarray(values).reshape(-1)
+    signature = "{}:{}:{}".format(values.dtype.str, values.size, zlib.crc32(values.view(np.uint8)))
+
+    mask = np.ma.getmask(data)
+    if mask is not np.ma.nomask:
+        signature += ":{}".format(zlib.crc32(np.ascontiguousarray(mask).view(np.uint8)))
+
+    return signature.encode()
+
+
+def data_signature(figure) -> str:
+    '''Compute a signature of the data plotted on a figure.
+
+    The signature covers the number of lines and collections on each axes and, for each line, the
+    dtype, length and a checksum of all of its x and y data and of their masks.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Figure containing the plotted data.
+
+    Returns
+    -------
+    signature : str
+        Hex digest of the data.
+    '''
+    digest = hashlib.sha1()
+
+    for axes in figure.get_axes():
+        lines = axes.get_lines()
+        digest.update("axes:{}:{}".format(len(lines), len(axes.collections)).encode())
+        for line in lines:
+            digest.update(_array_bytes(line.get_xdata()))
+            digest.update(_array_bytes(line.get_ydata()))
+
+    return digest.hexdigest()
+
+
+def _normalise(value):
+
+    # Arrays are converted to lists so their repr is not summarised
+    # =============================================================================================
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalise(v) for k, v in sorted(value.items())}
+
+    return value
+
+
+def stage_digests(stages, stage_keys, settings, signature, kwargs) -> dict:
+    '''Compute the digest of each formatting stage.
+
+    Parameters
+    ----------
+    stages : tuple
+        Names of the stages, in the order they are run.
+    stage_keys : dict
+        Inputs of each stage. Entries are kwargs names, earlier stage names or 'data' for the
+        plotted data. Stages not in the dict are always run and get no digest.
+    settings : tuple
+        Formatter settings shared by all stages (e.g. class name, shape and font size).
+    signature : str
+        Data signature of the figure, see `data_signature`.
+    kwargs : dict
+        Formatting kwargs of the call.
+
+    Returns
+    -------
+    digests : dict
+        Hex digest of each stage listed in `stage_keys`.
+    '''
+    digests = {}
+
+    for stage in stages:
+        if stage not in stage_keys:
+            continue
+
+        inputs = [stage, _normalise(settings)]
+        for key in stage_keys[stage]:
+            if key == "data":
+                inputs.append(signature)
+            elif key in digests:
+                inputs.append(digests[key])
+            else:
+                inputs.append((key, _normalise(kwargs.get(key))))
+
+        digests[stage] = hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+    return digests
@@ -0,0 +1,58 @@
+'''
+This module contains the process-wide font cache shared by all format classes.
+
+Font families are resolved to a font file through the matplotlib font manager once per process.
+The resulting `FontProperties` point directly at that file, so matplotlib does not repeat the
+lookup (or the fallback warning for missing fonts) for every text artist.
+'''
+
+from functools import lru_cache
+
+from matplotlib import font_manager
+from matplotlib.font_manager import FontProperties
+
+from .default_values import _default_font_family, _font_role_scale
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_file(family) -> str:
+
+    # Falls back to the matplotlib default font if the family is not installed. Newer matplotlib
+    # versions return a FontPath object, which is reduced to a plain string so figures using the
+    # font can still be pickled.
+    # =============================================================================================
+    return str(font_manager.findfont(FontProperties(family=family)))
+
+
+@lru_cache(maxsize=None)
+def _cached_font(family, size) -> FontProperties:
+
+    return FontProperties(fname=_resolve_font_file(family), size=size)
+
+
+def role_font(role, fontsize, family=_default_font_family) -> FontProperties:
+    '''Get the cached font for a text role.
+
+    The returned object is shared between all format objects and must not be modified.
+
+    Parameters
+    ----------
+    role : str, {default, axes, title, tick, legend}
+        Role of the text. The title is 1.2 times the size of the other roles.
+    fontsize : float
+        Base font size in points.
+    family : str, optional
+        Font family. (default value is 'Times New Roman')
+
+    Returns
+    -------
+    font : matplotlib.font_manager.FontProperties
+        Resolved font properties for the role.
+    '''
+    try:
+        scale = _font_role_scale[role]
+    except KeyError:
+        raise ValueError("Font role '{}' not recognized. Options are {}"
+                         .format(role, ", ".join(_font_role_scale))) from None
+
+    return _cached_font(family, float(fontsize)*scale)
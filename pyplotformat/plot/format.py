@@ -3,9 +3,27 @@ This module contains the base Format() class from which other format classes tha
 plot types are derived.
 '''
 
-from matplotlib import pyplot as plt
-import matplotlib.ticker as mticker
-from .default_values import _default_colors, _default_format_opts
+import copy
+
+import numpy as np
+from matplotlib.colors import same_color
+from matplotlib.text import Annotation
+
+from .._state import figure_state
+from .default_values import _default_format_opts, _figure_sizes, \
+                            _fallback_figure_size
+from .annotate import place_labels, last_finite
+from .colors import line_colors
+from .consolidate import consolidate_lines, restore_lines
+from .decimate import decimate_line, restore_line
+from .extent import Extent, axes_extent
+from .fingerprint import data_signature, stage_digests
+from .fonts import role_font
+from .layout import fixed_layout
+from .rasterize import raster_dpi, rasterize_artists, vectorize_artists
+from .stats import FormatStats, _stage_name, _timed
+from .textmetrics import text_size
+from .ticks import plan_ticks
 
 
 class Format():
@@ -26,6 +44,12 @@ class Format():
         attribute of the class. (default value is 10.0)
     saveloc : str, optional
         Directory location for plot objects to be saved to. (default value is '.')
+    profile : bool, optional
+        If `True` the wall time of each formatting stage is recorded in the `stats` attribute
+        after every call. (default value is `False`)
+    hook : callable, optional
+        Function called with the `FormatStats` of every call, e.g. to send them to a metrics
+        pipeline. Setting a hook enables profiling. (default value is None)
 
     Attributes
     ----------
@@ -38,6 +62,8 @@ class Format():
         attribute of the class.
     saveloc : str
         Directory location for plot objects to be saved to.
+    stats : FormatStats
+        Stage timings of the last call if profiling is enabled, otherwise None.
     SMALL_SIZE : float
         Size for small font text, equals 0.8*fontsize
     MEDIUM_SIZE : float
@@ -45,67 +71,165 @@ class Format():
     LARGE_SIZE : float
         Size fot large plot text, equals 1.2*fontsize
     defaultfont : Dict
-        Matplotlib kwargs dict for font. Describes default font family and size
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for default text
     axesfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes labels
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes labels
     titlefont : Dict
-        Matplotlib kwargs dict for font. Describes font for title.
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for the title.
     tickfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes ticks
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes ticks
     legendfont : Dict
-        Matplotlib kwargs dict for font. Describes font for legends
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for legends
     '''
     # pylint: disable=too-many-instance-attributes
 
     # pylint: disable=too-few-public-methods
     # This class is intended for internal use
 
+    # Formatting methods run by __call__, in order. Defined by the child classes
+    _stages = ()
+
+    # Inputs of each stage, used to skip stages already applied with the same inputs. Entries are
+    # kwargs names, earlier stage names or 'data'. Stages not listed are always run.
+    _stage_keys = {}
+
+    # Stages that add artists to the figure, which are removed before the stage is re-applied
+    _artist_stages = ()
+
+    # Stages run once for the whole figure. All other stages are run for each axes in turn
+    _figure_stages = ("_format_fig_size", "_format_tight_layout", "_display")
+
     def __init__(   self,
                     shape="single",
                     fontsize=10,
-                    saveloc="."
+                    saveloc=".",
+                    profile=False,
+                    hook=None
                 ) -> None:
 
         self.shape      = shape
         self.saveloc    = saveloc
         self.fontsize   = fontsize
 
+        self.profile    = profile or hook is not None
+        self.hook       = hook
+        self.stats      = None
+
 
         self.small_size = fontsize*0.8
         self.medium_size = fontsize
         self.bigger_size = fontsize*1.2
 
-        self.defaultfont = {"family":   "Times New Roman",
-                            "size":     self.medium_size,
-                            }
+        self.defaultfont = {"fontproperties": role_font("default", fontsize)}
 
-        self.axesfont = dict(self.defaultfont)
+        self.axesfont = {"fontproperties": role_font("axes", fontsize)}
 
-        self.titlefont = dict(self.defaultfont)
-        self.titlefont['size'] = self.bigger_size
+        self.titlefont = {"fontproperties": role_font("title", fontsize)}
 
-        self.tickfont = dict(self.defaultfont)
+        self.tickfont = {"fontproperties": role_font("tick", fontsize)}
 
-        self.legendfont = dict(self.defaultfont)
+        self.legendfont = {"fontproperties": role_font("legend", fontsize)}
 
         self.figure = None
         self.axes = None
+        self._panels = []
+
+        # Results shared by the axes of a figure during a single call, e.g. the data extent and
+        # tick plans of shared axes
+        self._shared = {}
 
+        # Set by stages that modify the plotted data (or the number of collections), after which
+        # the data signature is computed again
+        self._data_modified = False
 
         self.default_format_opts = _default_format_opts
 
 
+    def format_many(self,
+                    figures,
+                    options = None,
+                    filepaths = None,
+                    workers : int = None,
+                    writer = None
+                    ) -> list:
+        '''Format, and optionally write, many figures across a pool of worker processes.
+
+        Each figure is formatted independently with a copy of this formatter. A figure that fails
+        does not stop the batch, its error is returned in the corresponding `BatchResult`.
+
+        Parameters
+        ----------
+        figures : list
+            Matplotlib `Figure` objects or figure builders. A builder is a picklable callable (e.g.
+            a module level function or `functools.partial`) that takes no arguments and returns a
+            `Figure` or a `(Figure, Axes)` tuple. Builders are called in the worker process.
+        options : dict or list, optional
+            Formatting kwargs passed to the `__call__` method. Either a single dict used for every
+            figure or a list with one dict per figure. (default value is None, which uses the
+            default options)
+        filepaths : list, optional
+            Name of the output file for each figure. If given each figure is written with `writer`
+            in the worker and closed. (default value is None, which returns the formatted figures)
+        workers : int, optional
+            Number of worker processes. If 1 the figures are formatted in the calling process.
+            (default value is None, which uses the number of CPUs)
+        writer : callable, optional
+            Function used to write each figure with the signature `writer(figure, filepath)`.
+            (default value is None, which uses `write_pdf`)
+
+        Returns
+        -------
+        results : list
+            `BatchResult` for each figure in input order. `result` is the output file path if
+            `filepaths` is given, otherwise the formatted `Figure` object.
+        '''
+        # The batch and write modules load multiprocessing, so they are only imported when used
+        # pylint: disable=import-outside-toplevel
+        from ..io.batch import _run_batch
+        from ..io.write import write_pdf
+
+        figures = list(figures)
+        writer = write_pdf if writer is None else writer
+
+        if options is None:
+            options = {}
+        if isinstance(options, dict):
+            options = [options]*len(figures)
+        elif len(options) != len(figures):
+            raise ValueError("Length of options should be equal to the number of figures")
+
+        if filepaths is None:
+            filepaths = [None]*len(figures)
+        elif len(filepaths) != len(figures):
+            raise ValueError("Length of filepaths should be equal to the number of figures")
+
+        # Detach the last formatted figure and the hook so they are not sent to every worker
+        formatter = copy.copy(self)
+        formatter.figure = None
+        formatter.axes = None
+        formatter._shared = {} # pylint: disable=protected-access
+        formatter._panels = [] # pylint: disable=protected-access
+        formatter.hook = None
+        formatter.stats = None
+
+        jobs = [(formatter, fig, dict(opts), path, writer)
+                for fig, opts, path in zip(figures, options, filepaths)]
+
+        return _run_batch(_format_job, jobs, workers)
+
+
     def _parse_input(self,
                     figure,
                     **kwargs) -> dict:
 
         # Assign figure and axes to object attributes
         self.figure = figure
-        if len(self.figure.get_axes()) == 1:
-            self.axes = self.figure.get_axes()[0]
-        else:
-            raise ValueError("Figure contains multiple axes. Only figures with one axes object are\
-            supported")
+        self._panels = _panel_axes(self.figure)
+        if not self._panels:
+            raise ValueError("Figure contains no axes that can be formatted. Figures with several "
+                             "axes are formatted as a grid of subplots, colorbars, twin axes and "
+                             "insets are not formatted")
+        self.axes = self._panels[0]
 
         # Parse optional arguments or assign default values
         for key, value in self.default_format_opts.items():
@@ -114,33 +238,188 @@ class Format():
 
         return kwargs
 
+    def _run_stages(self,
+                    **kwargs):
+
+        # Run each formatting stage that is not already applied to the figure with the same
+        # inputs, timing them only if profiling is enabled
+        # =========================================================================================
+        state = figure_state(self.figure)
+
+        # Loaders store the signature of the data they restored, so it is not computed again
+        signature = state.pop("signature", None) or data_signature(self.figure)
+        digests = self._stage_digests(signature, kwargs)
+        applied = {} if kwargs['force'] else state.get("digests", {})
+        artists = state.setdefault("artists", {})
+
+        if self.profile:
+            self.stats = FormatStats(type(self).__name__)
+
+        self._data_modified = False
+        for stage in self._stages:
+            if stage in digests and applied.get(stage) == digests[stage]:
+                continue
+
+            # Remove artists added when the stage was last applied
+            for artist in artists.pop(stage, []):
+                _remove_artist(artist)
+
+            if stage in self._artist_stages:
+                before = set(map(id, self._figure_artists()))
+
+            if self.profile:
+                _timed(self.stats, _stage_name(stage), self._apply_stage, stage, **kwargs)
+            else:
+                self._apply_stage(stage, **kwargs)
+
+            if stage in self._artist_stages:
+                artists[stage] = [a for a in self._figure_artists() if id(a) not in before]
+
+        # Stages such as decimation modify the data, so the stored digests must match the result
+        if self._data_modified and data_signature(self.figure) != signature:
+            digests = self._stage_digests(data_signature(self.figure), kwargs)
+
+        state["digests"] = digests
+        state["formatter"] = self._settings()
+        state["kwargs"] = {k: v for k, v in kwargs.items() if k != 'force'}
+
+        # Single axes figures return their axes, subplot grids the list of panels
+        self.axes = self._panels[0] if len(self._panels) == 1 else list(self._panels)
+
+        if self.profile and self.hook is not None:
+            self.hook(self.stats)
+
+
+    def _apply_stage(self, stage, **kwargs) -> None:
+
+        # Run a figure stage once, or an axes stage for each panel with self.axes set to it
+        # =========================================================================================
+        if stage in self._figure_stages:
+            getattr(self, stage)(**kwargs)
+            return
+
+        self._shared = {}
+        try:
+            for axes in self._panels:
+                self.axes = axes
+                getattr(self, stage)(**kwargs)
+        finally:
+            self._shared = {}
+
+
+    def _shared_once(self, name, siblings, function):
+
+        # Result of function for a group of shared axes, computed for the first axes of the group
+        # and reused by the others during the current stage
+        # =========================================================================================
+        key = (name, frozenset(map(id, siblings)))
+        if key not in self._shared:
+            self._shared[key] = function()
+
+        return self._shared[key]
+
+
+    def _shared_extent(self, live) -> Extent:
+
+        # Data extent of self.axes, with the x and y ranges extended over the axes sharing them so
+        # shared axes are given the same limits
+        # =========================================================================================
+        def extent_of(axes):
+            return self._shared_once("extent", [axes], lambda: axes_extent(axes, running=live))
+
+        def group_extent(siblings):
+            extent = Extent()
+            for axes in siblings:
+                extent.update(extent_of(axes))
+            return extent
+
+        xaxes = self.axes.get_shared_x_axes().get_siblings(self.axes)
+        yaxes = self.axes.get_shared_y_axes().get_siblings(self.axes)
+        if len(xaxes) == 1 and len(yaxes) == 1:
+            return extent_of(self.axes)
+
+        xextent = self._shared_once("xextent", xaxes, lambda: group_extent(xaxes))
+        yextent = self._shared_once("yextent", yaxes, lambda: group_extent(yaxes))
+
+        extent = Extent()
+        extent.xmin, extent.xmax = xextent.xmin, xextent.xmax
+        extent.ymin, extent.ymax = yextent.ymin, yextent.ymax
+
+        return extent
+
+
+    def _shared_tick_plan(self, axis, **options):
+
+        # Tick plan of an axis, planned once for all axes sharing it
+        # =========================================================================================
+        if axis is self.axes.xaxis:
+            name, siblings = "xticks", self.axes.get_shared_x_axes().get_siblings(self.axes)
+        else:
+            name, siblings = "yticks", self.axes.get_shared_y_axes().get_siblings(self.axes)
+
+        return self._shared_once(name, siblings, lambda: plan_ticks(axis, **options))
+
+
+    def _is_outer(self, edge) -> bool:
+
+        # True if self.axes is on the given edge ('bottom' or 'left') of its subplot grid. Axes
+        # that are not part of a grid are always outer axes
+        # =========================================================================================
+        spec = self.axes.get_subplotspec()
+        if spec is None or len(self._panels) == 1:
+            return True
+
+        return spec.is_last_row() if edge == "bottom" else spec.is_first_col()
+
+
+    def _set_title(self, title) -> None:
+
+        # A single axes takes the title, subplot grids share a figure title
+        # =========================================================================================
+        if len(self._panels) == 1:
+            self.axes.set_title(title, **self.titlefont)
+        else:
+            self.figure.suptitle(title, **self.titlefont)
+
+
+    def _settings(self) -> tuple:
+
+        return (type(self).__name__, self.shape, self.fontsize)
+
+
+    def _stage_digests(self, signature, kwargs) -> dict:
+
+        return stage_digests(self._stages, self._stage_keys, self._settings(), signature, kwargs)
+
+
+    def _figure_artists(self) -> list:
+
+        return [artist for axes in self.figure.get_axes() for artist in axes.get_children()]
+
+
     def _format_fig_size(self,
                        **kwargs):
 
         # Set figsize
         # =========================================================================================
-        if self.shape == "single":
-            self.figure.set_size_inches(3.14961, 2.756) # 8cm x 7cm
-        elif self.shape == "double":
-            self.figure.set_size_inches(6.29921, 2.756) # 16cm x 7cm
-        elif self.shape == "large":
-            self.figure.set_size_inches(6.29921, 5.512) # 16cm x 14cm
+        if self.shape in _figure_sizes:
+            self.figure.set_size_inches(*_figure_sizes[self.shape])
         else:
             print("Plotter warning: shape attribute: {} not recognized, defaulting to \"single\".")
-            self.figure.set_size_inches(3.14961, 3.14961) # 8cm x 8cm
+            self.figure.set_size_inches(*_fallback_figure_size)
 
 
     def _format_axes_labels(self,
                           **kwargs):
 
-        # Set label and titles
+        # Set label and titles. Axis labels of subplot grids are only set on the outer axes
         # =========================================================================================
-        if kwargs['xlabel'] is not None:
+        if kwargs['xlabel'] is not None and self._is_outer("bottom"):
             self.axes.set_xlabel(kwargs['xlabel'], **self.axesfont)
-        if kwargs['ylabel'] is not None:
+        if kwargs['ylabel'] is not None and self._is_outer("left"):
             self.axes.set_ylabel(kwargs['ylabel'], **self.axesfont)
         if kwargs['title'] is not None:
-            self.axes.set_suptitle(kwargs['title'], **self.titlefont)
+            self._set_title(kwargs['title'])
 
 
     def _format_ticks(self,
@@ -148,22 +427,25 @@ class Format():
 
         # Set tick formatting
         # =========================================================================================
-        if kwargs["x_tick_loc"] is None:
-            ticks_loc = self.axes.get_xticks().tolist()
-        else:
-            ticks_loc = kwargs["x_tick_loc"]
-        self.axes.xaxis.set_major_locator(mticker.FixedLocator(ticks_loc))
+        xplan = self._shared_tick_plan(self.axes.xaxis, locations=kwargs["x_tick_loc"])
+        yplan = self._shared_tick_plan(self.axes.yaxis, locations=kwargs["y_tick_loc"])
+
+        self._apply_tick_plans((xplan, yplan), kwargs['live'])
 
-        if kwargs["y_tick_loc"] is None:
-            ticks_loc = self.axes.get_yticks().tolist()
-        else:
-            ticks_loc = kwargs["y_tick_loc"]
-        self.axes.yaxis.set_major_locator(mticker.FixedLocator(ticks_loc))
 
-        self.axes.set_xticklabels(self.axes.get_xticks(), **self.tickfont)
-        self.axes.set_yticklabels(self.axes.get_yticks(), **self.tickfont)
-        self.axes.xaxis.set_major_formatter('{x:.5g}')
-        self.axes.yaxis.set_major_formatter('{x:.5g}')
+    def _apply_tick_plans(self, plans, live) -> None:
+
+        # Apply the x and y tick plans. Cached plans are shared, so in live mode plans identical
+        # to the ones already applied are skipped and the ticks are not redrawn
+        # =========================================================================================
+        applied = figure_state(self.figure).setdefault("tick_plans", {})
+        if live and applied.get(self.axes) == plans:
+            return
+
+        for axis, plan in zip((self.axes.xaxis, self.axes.yaxis), plans):
+            plan.apply(axis, self.tickfont["fontproperties"])
+
+        applied[self.axes] = plans
 
 
     def _format_line_colors(self,
@@ -171,22 +453,12 @@ class Format():
 
         # Set line colors
         # =========================================================================================
-        if kwargs['blackline']:
-            color_val = ["#000000"]*len(self.axes.get_lines())
-        else:
-            color_val = _default_colors
-        if kwargs['color'] is not None:
-            if len(kwargs['color']) != len(self.axes.get_lines()):
-                raise ValueError("Length of specified color array should be equal to number of\
-                                  lines in given matplotlib.pyplot.Axes object")
-            for ii, col in enumerate(kwargs['color']):
-                if col is not None:
-                    color_val = color_val[:ii] + [col] + color_val[ii:]
-                
+        lines = self.axes.get_lines()
+        colors = line_colors(len(lines), kwargs['color'], kwargs['palette'], kwargs['blackline'])
 
-        for ii, line in enumerate(self.axes.get_lines()):
-            if color_val[ii] is not None:
-                line.set_color(color_val[ii])
+        for line, color in zip(lines, colors):
+            if not same_color(line.get_color(), color):
+                line.set_color(color)
 
 
     def _format_line_annotation(self,
@@ -198,12 +470,43 @@ class Format():
             if len(kwargs['shortlabel']) != len(self.axes.get_lines()):
                 raise ValueError("Length of specified annotation array should be equal to number\
                                   of lines in given matplotlib.pyplot.Axes object")
+
+            annotations = []
             for line, name in zip(self.axes.get_lines(), kwargs['shortlabel']):
-                y = line.get_ydata()[-1]
-                self.axes.annotate(name, xy=(1,y), xytext=(6,0), color=line.get_color(),
-                                xycoords=self.axes.get_yaxis_transform(),
-                                textcoords="offset points", size = 10, va="center",
-                                family="Times New Roman")
+                yy = last_finite(line.get_ydata())
+                if not np.isfinite(yy):
+                    continue
+                annotations.append(self.axes.annotate(name, xy=(1,yy), xytext=(6,0),
+                                   color=line.get_color(),
+                                   xycoords=self.axes.get_yaxis_transform(),
+                                   textcoords="offset points", va="center", **self.defaultfont))
+
+            self._place_annotations(self.axes, annotations)
+
+
+    def _place_annotations(self, axes, annotations) -> None:
+
+        # Shift the line annotations of an axes so they do not overlap. Shifts are in points, so
+        # they are computed again when the layout changes the height of the axes
+        # =========================================================================================
+        if not annotations:
+            return
+
+        # Label positions in points from the bottom of the axes. The display transform of the
+        # annotation coordinates is used, so polar axes are handled as well
+        y = np.array([annotation.xy[1] for annotation in annotations], dtype=float)
+        display = axes.get_yaxis_transform().transform(np.column_stack((np.ones_like(y), y)))
+        to_points = 72/self.figure.dpi
+        axes_height = axes.bbox.height*to_points
+        label_height = 1.2*text_size("lp", self.defaultfont["fontproperties"])[1]
+
+        target = (display[:, 1] - axes.bbox.y0)*to_points
+        valid = np.isfinite(target)
+        placed = target.copy()
+        placed[valid] = place_labels(target[valid], label_height, 0.0, axes_height)
+
+        for annotation, shift in zip(annotations, placed - target):
+            annotation.xyann = (6, shift if np.isfinite(shift) else 0)
 
 
     def _format_axes_limits(self,
@@ -213,29 +516,68 @@ class Format():
         # =========================================================================================
 
         if kwargs['xylim'] is None:
-            xmin = 1e20
-            xmax = 1e-20
-            ymin = 1e20
-            ymax = 1e-20
-            for line in self.axes.get_lines():
-                # Remove None data for comparison
-                x_data = [x for x in line.get_xdata() if x is not None]
-                y_data = [y for y in line.get_ydata() if y is not None]
-                if min(x_data) < xmin: 
-                    xmin = min(x_data)
-                if max(x_data) > xmax:
-                    xmax = max(x_data)
-                if min(y_data) < ymin:
-                    ymin = min(y_data)
-                if max(y_data) > ymax:
-                    ymax = max(y_data)
-
-
-            self.axes.set_xlim(kwargs['lxpad']*xmin, kwargs['uxpad']*xmax)
-            self.axes.set_ylim(kwargs['lypad']*ymin, kwargs['uypad']*ymax)
+            extent = self._shared_extent(kwargs['live'])
+            if extent.valid_x:
+                _set_limits(self.axes.get_xlim, self.axes.set_xlim,
+                            kwargs['lxpad']*extent.xmin, kwargs['uxpad']*extent.xmax)
+            if extent.valid_y:
+                _set_limits(self.axes.get_ylim, self.axes.set_ylim,
+                            kwargs['lypad']*extent.ymin, kwargs['uypad']*extent.ymax)
         else:
-            self.axes.set_xlim(kwargs['xylim'][0], kwargs['xylim'][1])
-            self.axes.set_ylim(kwargs['xylim'][2], kwargs['xylim'][3])
+            _set_limits(self.axes.get_xlim, self.axes.set_xlim, *kwargs['xylim'][0:2])
+            _set_limits(self.axes.get_ylim, self.axes.set_ylim, *kwargs['xylim'][2:4])
+
+
+    def _format_line_decimation(self,
+                                **kwargs):
+
+        # Reduce lines to the resolution of the axes at its physical size. Lines decimated by an
+        # earlier call are restored first
+        # =========================================================================================
+        width = self.figure.get_figwidth()*self.axes.get_position().width
+        n_pixels = max(int(width*kwargs['decimate_dpi']), 1)
+
+        for line in self.axes.get_lines():
+            modified = restore_line(line)
+            if kwargs['decimate'] is not None:
+                modified = decimate_line(line, n_pixels, kwargs['decimate']) or modified
+            self._data_modified = self._data_modified or modified
+
+
+    def _format_line_consolidation(self,
+                                   **kwargs):
+
+        # Draw lines with the same style and label as a single LineCollection. Lines of the axes
+        # hidden by an earlier call are restored first, the collections it added are removed by
+        # _run_stages
+        # =========================================================================================
+        hidden = figure_state(self.figure).setdefault("consolidated", {})
+        restored = {line: hidden.pop(line) for line in self.axes.get_lines() if line in hidden}
+        restore_lines(restored)
+
+        consolidated = consolidate_lines(self.axes) if kwargs['consolidate'] else {}
+        hidden.update(consolidated)
+
+        self._data_modified = self._data_modified or bool(restored or consolidated)
+
+
+    def _format_rasterization(self,
+                              **kwargs):
+
+        # Mark heavy artists as rasterized for vector output. Artists of the axes marked by an
+        # earlier call are drawn as vectors again first
+        # =========================================================================================
+        state = figure_state(self.figure)
+        marked = state.setdefault("rasterized", [])
+        vectorize_artists([artist for artist in marked if artist.axes is self.axes])
+        marked[:] = [artist for artist in marked if artist.axes not in (self.axes, None)]
+
+        if kwargs['rasterize'] is None:
+            state.pop("raster_dpi", None)
+            return
+
+        marked.extend(rasterize_artists(self.axes, kwargs['rasterize']))
+        state["raster_dpi"] = raster_dpi(self.shape)
 
 
     def _format_axes_scale(self,
@@ -252,13 +594,94 @@ class Format():
     def _format_tight_layout(self,
                            **kwargs):
 
-        xt = self.axes.get_xticks()
-        if kwargs['xylim'] is not None:
-            xt = [t for t in xt if kwargs['xylim'][0] <= t <= kwargs['xylim'][1]]
+        # Fix the axes position so the text fits inside the figure, writers then use the figure
+        # size as the page size without measuring the figure again
+        # =========================================================================================
+        if kwargs['layout'] not in ("fixed", "tight"):
+            raise ValueError("Layout '{}' not recognized. Options are fixed, tight"
+                             .format(kwargs['layout']))
+
+        if kwargs['layout'] == "fixed":
+            fixed_layout(self.figure, self._settings())
+
+            # Line annotations are placed for the height of the axes before the layout
+            added = figure_state(self.figure).get("artists", {})
+            annotations = [artist for artist in added.get("_format_line_annotation", [])
+                           if isinstance(artist, Annotation)]
+            for axes in self._panels:
+                self._place_annotations(axes, [a for a in annotations if a.axes is axes])
+
+        figure_state(self.figure)["layout"] = kwargs['layout']
 
 
     def _display(self,
                  **kwargs):
 
         if kwargs['show']:
+            from matplotlib import pyplot as plt # pylint: disable=import-outside-toplevel
             plt.show()
+
+
+def _format_job(formatter, figure, options, filepath, writer, pooled):
+
+    # Format, and optionally write, a single figure of a batch
+    # =============================================================================================
+    from ..io.batch import _build_figure, _close_figure # pylint: disable=import-outside-toplevel
+
+    figure, built = _build_figure(figure)
+    try:
+        formatter(figure, **options)
+        if filepath is None:
+            return figure
+        writer(figure, filepath)
+        return filepath
+    finally:
+        if pooled or (built and filepath is not None):
+            _close_figure(figure)
+
+
+def _is_colorbar(axes) -> bool:
+
+    return getattr(axes, "_colorbar", None) is not None or axes.get_label() == "<colorbar>"
+
+
+def _panel_axes(figure) -> list:
+
+    # Axes formatted by the formatters. A single axes is always formatted. In figures with several
+    # axes only the subplots are formatted, colorbars, twin axes (which share the subplot of an
+    # earlier axes) and insets or other axes without a subplot are skipped
+    # =============================================================================================
+    axes_list = figure.get_axes()
+    if len(axes_list) == 1:
+        return axes_list
+
+    panels, subplots = [], set()
+    for axes in axes_list:
+        spec = axes.get_subplotspec()
+        if spec is None or _is_colorbar(axes):
+            continue
+
+        subplot = (id(spec.get_gridspec()), spec.num1, spec.num2)
+        if subplot not in subplots:
+            subplots.add(subplot)
+            panels.append(axes)
+
+    return panels
+
+
+def _set_limits(get_limits, set_limits, vmin, vmax) -> None:
+
+    # Limits are only set when they change, so an unchanged axis is not marked for redrawing
+    # =============================================================================================
+    if tuple(get_limits()) != (vmin, vmax):
+        set_limits(vmin, vmax)
+
+
+def _remove_artist(artist) -> None:
+
+    # The artist may already have been removed by the user
+    # =============================================================================================
+    try:
+        artist.remove()
+    except (ValueError, NotImplementedError):
+        pass
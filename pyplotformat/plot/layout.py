@@ -0,0 +1,202 @@
+'''
+This module contains the fixed layout methods used by the format classes.
+
+The fixed layout places the axes so the axes, tick labels, axis labels, title and annotations fit
+inside the figure at its `shape` size. Subplot grids are laid out with the matplotlib tight layout
+engine, leaving room for the figure title. Writers can then save the figure with a single draw
+pass, instead of measuring it with `bbox_inches="tight"` first, and the page size is exactly the
+size of the figure. Layouts are cached by the text on the figure, so figures with the same shape,
+font size, labels and tick labels reuse the same layout without measuring it, and text sizes of
+single axes are read from the shared text metrics cache when a layout is measured.
+'''
+
+import warnings
+from collections import OrderedDict
+
+from matplotlib import rcParams
+from matplotlib.layout_engine import TightLayoutEngine
+
+from .textmetrics import cached_renderer, text_size
+
+_MAX_CACHED_LAYOUTS = 256
+
+# Padding between the figure edge and the outermost text in inches. Equal to the default
+# `savefig.pad_inches`, so the fixed layout matches the spacing of a tight bounding box
+_LAYOUT_PAD = 0.1
+
+# Number of measurement passes. A second pass corrects for text that moves with the axes
+_LAYOUT_PASSES = 2
+
+# Smallest size of a single axes, as a fraction of the figure, when its text does not fit
+_MIN_AXES_FRACTION = 0.1
+
+_layout_cache = OrderedDict()
+
+
+def _text_key(texts, transform) -> tuple:
+
+    # Visible text and its position in axes coordinates, rounded so data-level noise is ignored
+    # =============================================================================================
+    key = []
+    for text in texts:
+        if not text.get_visible() or not text.get_text():
+            continue
+        x, y = transform.transform(text.get_transform().transform(text.get_position()))
+        key.append((text.get_text(), round(x, 2), round(y, 2), text.get_fontsize(),
+                    text.get_rotation()))
+
+    return tuple(key)
+
+
+def _axes_key(axes) -> tuple:
+
+    # Axis labels and the title are positioned when drawn, so only their text is used
+    # =============================================================================================
+    to_axes = axes.transAxes.inverted()
+    ticks = [*axes.xaxis.get_majorticklabels(), *axes.yaxis.get_majorticklabels()]
+    labels = tuple((text.get_text(), text.get_fontsize())
+                   for text in (axes.xaxis.label, axes.yaxis.label, axes.title))
+
+    return (axes.name, labels, _text_key(ticks, to_axes), _text_key(axes.texts, to_axes))
+
+
+def layout_key(figure, settings) -> tuple:
+    '''Key of the layout of a figure.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Formatted figure.
+    settings : tuple
+        Formatter settings (e.g. class name, shape and font size).
+
+    Returns
+    -------
+    key : tuple
+        Hashable key combining the settings, the figure size and the text on each axes.
+    '''
+    suptitle = figure._suptitle # pylint: disable=protected-access
+    title = (suptitle.get_text(), suptitle.get_fontsize()) if suptitle is not None else None
+
+    return (tuple(settings), tuple(figure.get_size_inches()), title,
+            tuple(_axes_key(axes) for axes in figure.get_axes()))
+
+
+def _clamp_margins(start, end) -> tuple[float, float]:
+
+    # Margins on both sides of the axes in one direction, shrunk in proportion if they leave less
+    # than _MIN_AXES_FRACTION of the figure for the axes
+    # =============================================================================================
+    total = start + end
+    if total <= 1 - _MIN_AXES_FRACTION:
+        return start, end
+
+    scale = (1 - _MIN_AXES_FRACTION)/total
+
+    return start*scale, end*scale
+
+
+def _fit_axes(figure, axes, renderer) -> None:
+
+    # Move the edges of the axes so its tight bounding box is _LAYOUT_PAD inside the figure
+    # =============================================================================================
+    width, height = figure.bbox.width, figure.bbox.height
+    pad = _LAYOUT_PAD*figure.dpi
+
+    for _ in range(_LAYOUT_PASSES):
+        box = axes.get_position(original=True)
+        tight = axes.get_tightbbox(renderer, for_layout_only=True)
+        drawn = axes.get_position(original=False)
+
+        # Space taken by text outside of the drawn axes, in figure fractions
+        left = (drawn.x0*width - tight.x0 + pad)/width
+        right = (tight.x1 - drawn.x1*width + pad)/width
+        bottom = (drawn.y0*height - tight.y0 + pad)/height
+        top = (tight.y1 - drawn.y1*height + pad)/height
+
+        # Each direction is fitted on its own. Text that does not fit is cut on both sides
+        left, right = _clamp_margins(left, right)
+        bottom, top = _clamp_margins(bottom, top)
+
+        axes.set_position([left, bottom, 1 - left - right, 1 - bottom - top])
+        axes.apply_aspect()
+
+        if box.bounds == axes.get_position(original=True).bounds:
+            return
+
+
+def _fit_grid(figure) -> None:
+
+    # Adjust the subplot parameters of a grid so the tight bounding box of every axes fits inside
+    # the figure, below the figure title, with _LAYOUT_PAD between the axes and the figure edge.
+    # Axes outside the grid (e.g. insets) are ignored by the tight layout engine
+    # =============================================================================================
+    axes_list = figure.get_axes()
+    pad = _LAYOUT_PAD*72/rcParams["font.size"]
+
+    top = 1.0
+    suptitle = figure._suptitle # pylint: disable=protected-access
+    if suptitle is not None and suptitle.get_visible() and suptitle.get_text():
+        height = text_size(suptitle.get_text(), suptitle.get_fontproperties())[1]
+        top = suptitle.get_position()[1] - height/(72*figure.get_figheight())
+
+    engine = TightLayoutEngine(pad=pad, rect=(0, 0, 1, top))
+
+    for _ in range(_LAYOUT_PASSES):
+        box = [axes.get_position(original=True).bounds for axes in axes_list]
+
+        # Text that does not fit the figure keeps the current layout
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="(?i)tight.layout not applied")
+            warnings.filterwarnings("ignore", message="This figure includes Axes")
+            engine.execute(figure)
+
+        if box == [axes.get_position(original=True).bounds for axes in axes_list]:
+            return
+
+
+def fixed_layout(figure, settings) -> list:
+    '''Compute and apply the fixed layout of a figure.
+
+    A single axes is positioned so its tight bounding box fits inside the figure. The subplot
+    parameters of a grid are adjusted so every axes of the grid fits. Figures with several axes
+    that are not part of a grid keep their axes positions. The resulting axes
+    positions are cached with `layout_key`.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Formatted figure. The figure size, labels and ticks must be final.
+    settings : tuple
+        Formatter settings (e.g. class name, shape and font size).
+
+    Returns
+    -------
+    positions : list
+        Position of each axes as (left, bottom, width, height) in figure fractions.
+    '''
+    key = layout_key(figure, settings)
+
+    if key in _layout_cache:
+        _layout_cache.move_to_end(key)
+        positions = _layout_cache[key]
+    else:
+        axes_list = figure.get_axes()
+        if len(axes_list) == 1:
+            renderer = cached_renderer(figure._get_renderer()) # pylint: disable=protected-access
+            _fit_axes(figure, axes_list[0], renderer)
+        elif any(axes.get_subplotspec() is not None for axes in axes_list):
+            _fit_grid(figure)
+
+        positions = [axes.get_position(original=True).bounds for axes in figure.get_axes()]
+
+        _layout_cache[key] = positions
+        if len(_layout_cache) > _MAX_CACHED_LAYOUTS:
+            _layout_cache.popitem(last=False)
+
+    # Unchanged axes are not marked for redrawing
+    for axes, position in zip(figure.get_axes(), positions):
+        if axes.get_position(original=True).bounds != tuple(position):
+            axes.set_position(position)
+
+    return positions
@@ -2,31 +2,35 @@
 This module contains the base class for formatting figure legends.
 '''
 
-#==================================================================================================
-#
-# #TODO: Need to work out number of legend columns required based on
-#        width required of legend and using the wrap method to fix
-#        the width of each legend entry.
-#
-#==================================================================================================
+import numpy as np
+from matplotlib import colors as mcolors
+from matplotlib import rcParams
+from matplotlib.container import Container
+from matplotlib.figure import Figure
 
-from matplotlib import pyplot as plt
+from ..headless import _new_figure
+from .default_values import _default_format_opts, _fallback_figure_size, _figure_sizes
+from .fonts import role_font
+from .textmetrics import text_size
 
-from .default_values import _default_format_opts
+# Artist properties compared when de-duplicating legend entries. Properties an artist does not
+# have are skipped
+_STYLE_PROPERTIES = ("color", "facecolor", "edgecolor", "linestyle", "linewidth", "marker",
+                     "markersize", "markerfacecolor", "markeredgecolor", "hatch", "alpha")
+
+# Style properties holding colors, compared as RGBA values
+_COLOR_PROPERTIES = ("color", "facecolor", "edgecolor", "markerfacecolor", "markeredgecolor")
 
 
 class FormatLegend():
     '''This class contains the methods required to create and format matplotlib legends
     based on single or multiple fiugre inputs.
 
+    The formatter keeps no state between calls, so a single object can be reused for any number
+    of legends. Each call creates a new legend figure.
+
     Attributes
     ----------
-    axes : list
-        List of matplotlib.pyplot.Axes object in figures.
-    lines : list
-        List of matplotlib.pyplot.Line2D objects in figures.
-    labels : list
-        List of text labels associated with each line.
     SMALL_SIZE : float
         Size for small font text, equals 0.8*fontsize.
     MEDIUM_SIZE : float
@@ -34,9 +38,7 @@ class FormatLegend():
     LARGE_SIZE : float
         Size fot large plot text, equals 1.2*fontsize.
     defaultfont : Dict
-        Matplotlib kwargs dict for font. Describes default font family and size.
-    figlegend : matplotlib.pyplot.Figure
-        Figure object that contains the legend
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for default text.
     default_format_opts : Dict
         Default options for kwargs not provided to __call__().
 
@@ -48,35 +50,28 @@ class FormatLegend():
     fontsize : float, optional
         Legend fontsize in pt. Defaults to 10
     '''
-    # pylint: disable=too-many-instance-attributes
     # pylint: disable=too-few-public-methods
 
     def __init__(self, max_width="single", fontsize=10) -> None:
 
-        self.axes = []
-        self.lines = []
-        self.labels = []
-
         self.width = max_width
 
         self.small_size = fontsize*0.8
         self.medium_size = fontsize
         self.bigger_size = fontsize*1.2
 
-        self.defaultfont = {"family":   "Times New Roman",
-                            "size":     self.medium_size,
-                            }
-
-        self.figlegend = plt.figure(figsize=(3.14961, 3.14961))
+        self.defaultfont = {"fontproperties": role_font("legend", fontsize)}
 
         self.default_format_opts = _default_format_opts
 
 
-    def __call__(self, *figures, **kwargs) -> plt.Figure:
+    def __call__(self, *figures, **kwargs) -> Figure:
         '''Generate a legend for a set of figures.
 
-        Generate a legend for a single figure or set of figures for all labelled lines
-        plotted. Returns the formatted legend. This method can be called using *FormatLegend()*.
+        Generate a legend for a single figure or set of figures for all labelled artists
+        plotted (lines, scatter and other collections, bars). Artists with the same label and
+        style in several figures get a single entry, and labels starting with an underscore are
+        skipped. Returns the formatted legend. This method can be called using *FormatLegend()*.
         
         Parameters
         ----------
@@ -88,7 +83,9 @@ class FormatLegend():
         .. _Other Parameters:
         Other Parameters
         ----------------
-       
+        ncol : int, optional
+            Number of legend columns. (default value is None, which uses the most columns that
+            fit in the `max_width` of the legend)
         
         Returns
         -------
@@ -97,10 +94,9 @@ class FormatLegend():
         '''
 
         kwargs = self._parse_input(**kwargs)
-        self._assign_lines(*figures, **kwargs)
-        self._format_legend(**kwargs)
+        handles, labels = _legend_entries(figures)
 
-        return self.figlegend
+        return self._format_legend(handles, labels, **kwargs)
 
 
     def _parse_input(self,
@@ -113,22 +109,8 @@ class FormatLegend():
 
         return kwargs
 
-    def _assign_lines(self, *figures, **kwargs):
-
-        # Concatenate all axes objects together
-        for fig in figures:
-            self.axes += fig.get_axes()
 
-        # Get all lines in all axes
-        for axes in self.axes:
-            self.lines += axes.get_lines()
-
-        # Get label for each line
-        for line in self.lines:
-            self.labels.append(line._label)
-
-
-    def _format_legend(self, **kwargs):
+    def _format_legend(self, handles, labels, **kwargs) -> Figure:
 
         if kwargs['annotate']:
             
@@ -152,12 +134,117 @@ class FormatLegend():
             leg.get_frame().set_edgecolor("black")
             figlegend.tight_layout()
             '''
-        else:
-            leg = self.figlegend.legend(self.lines, self.labels, prop=self.defaultfont,
-                                        loc="center", ncol=kwargs["ncol"])
 
+        ncol = kwargs["ncol"]
+        if ncol is None:
+            ncol = self._auto_ncol(labels)
+
+        # The legend figure is only created once the entries are known
+        figlegend = _new_figure(figsize=_fallback_figure_size)
+        leg = figlegend.legend(handles, labels, prop=self.defaultfont["fontproperties"],
+                               loc="center", ncol=ncol)
 
         leg.get_frame().set_edgecolor("black")
-        for axes in self.figlegend.axes:
-            axes.remove()
-        self.figlegend.tight_layout()
+        figlegend.tight_layout()
+
+        return figlegend
+
+
+    def _auto_ncol(self, labels) -> int:
+
+        # Most columns whose total width fits the maximum width. Like matplotlib, entries are
+        # split into columns of nearly equal length, and a column is as wide as its widest entry
+        # =========================================================================================
+        if not labels:
+            return 1
+
+        font = self.defaultfont["fontproperties"]
+        fontsize = font.get_size_in_points()
+        max_width = 72*_figure_sizes.get(self.width, _fallback_figure_size)[0]
+
+        handle = (rcParams["legend.handlelength"] + rcParams["legend.handletextpad"])*fontsize
+        entries = np.array([text_size(label, font)[0] for label in labels]) + handle
+        spacing = rcParams["legend.columnspacing"]*fontsize
+        border = 2*(rcParams["legend.borderpad"] + rcParams["legend.borderaxespad"])*fontsize
+
+        for ncol in range(len(entries), 1, -1):
+            columns = np.maximum.reduceat(entries, _column_starts(len(entries), ncol))
+            if columns.sum() + spacing*(ncol - 1) + border <= max_width:
+                return ncol
+
+        return 1
+
+
+def _column_starts(n_entries, ncol) -> np.ndarray:
+
+    # Index of the first entry of each column, as split by numpy.array_split
+    # =============================================================================================
+    nrow, extra = divmod(n_entries, ncol)
+    sizes = np.full(ncol, nrow)
+    sizes[:extra] += 1
+
+    return np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+
+def _hashable(value):
+
+    # Artist properties as hashable values. Color arrays are rounded so equal colors compare equal
+    # =============================================================================================
+    if isinstance(value, np.ndarray):
+        return tuple(np.round(value.astype(float), 6).ravel().tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
+
+
+def _color_key(value):
+
+    # Colors as RGBA values, so 'red', '#ff0000' and (1, 0, 0, 1) compare equal
+    # =============================================================================================
+    try:
+        return _hashable(mcolors.to_rgba_array(value))
+    except (TypeError, ValueError):
+        return _hashable(value)
+
+
+def _style_key(handle) -> tuple:
+
+    # Containers (e.g. bars) are drawn in the legend with the style of their first artist
+    # =============================================================================================
+    if isinstance(handle, Container) and len(handle):
+        handle = handle[0]
+
+    key = [type(handle).__name__]
+    for prop in _STYLE_PROPERTIES:
+        getter = getattr(handle, "get_" + prop, None)
+        if getter is not None:
+            key.append(_color_key(getter()) if prop in _COLOR_PROPERTIES else _hashable(getter()))
+
+    return tuple(key)
+
+
+def _legend_entries(figures) -> tuple[list, list]:
+
+    # Legend handles of all axes with duplicate (label, style) entries removed in a single pass.
+    # Axes.get_legend_handles_labels skips labels that start with an underscore
+    # =============================================================================================
+    handles = []
+    labels = []
+    seen = set()
+
+    for figure in figures:
+        for axes in figure.get_axes():
+            for handle, label in zip(*axes.get_legend_handles_labels()):
+                key = (label, _style_key(handle))
+                if key in seen:
+                    continue
+                seen.add(key)
+                handles.append(handle)
+                labels.append(label)
+
+    return handles, labels
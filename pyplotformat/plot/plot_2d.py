@@ -1,7 +1,8 @@
 '''
 Format class for 2D plots.
 '''
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.axes import Axes
 
 from .format import Format
 
@@ -23,6 +24,12 @@ class Format2D(Format):
         attribute of the class. (default value is 10.0)
     saveloc : str, optional
         Directory location for plot objects to be saved to. (default value is '.')
+    profile : bool, optional
+        If `True` the wall time of each formatting stage is recorded in the `stats` attribute
+        after every call. (default value is `False`)
+    hook : callable, optional
+        Function called with the `FormatStats` of every call, e.g. to send them to a metrics
+        pipeline. Setting a hook enables profiling. (default value is None)
 
     Attributes
     ----------
@@ -35,6 +42,8 @@ class Format2D(Format):
         attribute of the class.
     saveloc : str
         Directory location for plot objects to be saved to.
+    stats : FormatStats
+        Stage timings of the last call if profiling is enabled, otherwise None.
     SMALL_SIZE : float
         Size for small font text, equals 0.8*fontsize
     MEDIUM_SIZE : float
@@ -42,31 +51,73 @@ class Format2D(Format):
     LARGE_SIZE : float
         Size fot large plot text, equals 1.2*fontsize
     defaultfont : Dict
-        Matplotlib kwargs dict for font. Describes default font family and size
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for default text
     axesfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes labels
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes labels
     titlefont : Dict
-        Matplotlib kwargs dict for font. Describes font for title.
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for the title.
     tickfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes ticks
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes ticks
     legendfont : Dict
-        Matplotlib kwargs dict for font. Describes font for legends
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for legends
     '''
     # pylint: disable=too-few-public-methods
     # Only need the __call__ method for this class
     # May add other set_ and get_ methods at a later date
 
+    _stages = ("_format_fig_size",
+               "_format_axes_labels",
+               "_format_line_colors",
+               "_format_axes_limits",
+               "_format_axes_scale",
+               "_format_line_annotation",
+               "_format_ticks",
+               "_format_line_decimation",
+               "_format_line_consolidation",
+               "_format_rasterization",
+               "_format_grid",
+               "_format_tight_layout",
+               "_display")
+
+    _stage_keys = { "_format_fig_size":         (),
+                    "_format_axes_labels":      ("xlabel", "ylabel", "title"),
+                    "_format_line_colors":      ("color", "palette", "blackline", "data"),
+                    "_format_axes_limits":      ("xylim", "lxpad", "uxpad", "lypad", "uypad",
+                                                 "data"),
+                    "_format_axes_scale":       ("xscale", "yscale"),
+                    "_format_line_annotation":  ("annotate", "shortlabel", "data",
+                                                 "_format_fig_size", "_format_line_colors",
+                                                 "_format_axes_limits", "_format_axes_scale"),
+                    "_format_ticks":            ("x_tick_loc", "y_tick_loc", "_format_fig_size",
+                                                 "_format_axes_limits", "_format_axes_scale"),
+                    "_format_line_decimation":  ("decimate", "decimate_dpi", "data",
+                                                 "_format_fig_size", "_format_axes_limits",
+                                                 "_format_axes_scale"),
+                    "_format_line_consolidation": ("consolidate", "data", "_format_line_colors",
+                                                   "_format_line_decimation"),
+                    "_format_rasterization":    ("rasterize", "data", "_format_line_decimation",
+                                                 "_format_line_consolidation"),
+                    "_format_grid":             ("grid",),
+                    "_format_tight_layout":     ("layout", "_format_fig_size",
+                                                 "_format_axes_labels", "_format_line_annotation",
+                                                 "_format_ticks"),
+                    }
+
+    _artist_stages = ("_format_line_annotation", "_format_line_consolidation")
+
     def __init__(self,
                  shape : str = "single",
                  fontsize : int = 10,
-                 saveloc : str = ".") -> None:
+                 saveloc : str = ".",
+                 profile : bool = False,
+                 hook = None) -> None:
 
-        super().__init__(shape, fontsize, saveloc)
+        super().__init__(shape, fontsize, saveloc, profile, hook)
 
     def __call__(self,
-                figure : plt.Figure,
+                figure : Figure,
                 **kwargs : dict
-                ) -> tuple[plt.Figure, plt.Axes]:
+                ) -> tuple[Figure, Axes]:
         '''Format a 2D figure according to class attributes and specified or default parameters.
 
         Format a matplotlib 2D (cartesian axis) figure containing an axes object with data already 
@@ -75,7 +126,10 @@ class Format2D(Format):
         Parameters
         ----------
         figure : matplotlib.pyplot.Figure
-            Matplotlib `Figure` object containing a single axes with data plotted.
+            Matplotlib `Figure` object containing a single axes or a grid of subplots with data
+            plotted. Each axes of a grid is formatted with the same options, axes with shared x or
+            y axes are given the same limits and ticks, axis labels are only set on the outer axes
+            of the grid and the title becomes the figure title.
         **kwargs : dict, optional
             Extra arguments that can be supplied to modify formatting. See :ref:'Other Parameters'
         
@@ -92,10 +146,15 @@ class Format2D(Format):
             If `True` will show the plot before it is returned using `matplotlib.pyplot.show()`
         color : list, optional
             List of colors defined by strings (either matplotlib aliases or hex codes) with a 
-            length equal to the number of lines. This can be used to override the default color
-            scheme. A subset of lines can keep the default color scheme by leaving the 
+            length equal to the number of lines of each axes. This can be used to override the
+            default color scheme. A subset of lines can keep the default color scheme by leaving the
             corresponding list position with a value of `None`. (default value is `None`, which
             uses default color scheme)
+        palette : str or list, optional
+            Colors used for the lines that are not overridden by `color`, in order. Either the name
+            of a matplotlib colormap (e.g. 'viridis'), which is sampled evenly across the lines, or
+            a list of colors, which is repeated when there are more lines than colors. (default
+            value is None, which repeats the default color scheme)
         shortlabel : list, optional
             List of strings that can be placed at the rightmost edge of each line to help define
             it. This label will replace the legend handle. Useful for plots that do not use color
@@ -135,27 +194,59 @@ class Format2D(Format):
         y_tick_loc : list, optional
             List of manual major y tick locations. By default or if given a None value matplotlib 
             automatically generates the locations. Default is None.
+        decimate : str, optional
+            Reduce lines to the number of points that can be shown at the physical width of the
+            figure before it is written. Options are 'minmax', which keeps the min/max envelope of
+            each pixel column, and 'lttb', which keeps one representative point per column. The
+            columns span the view limits in the scale of the x-axis (e.g. log), and points outside
+            the view are reduced to the points that keep the extent of the line. The original data
+            is kept and restored when the line is formatted again, e.g. with new limits or with
+            `decimate=None`. Lines with markers or non-monotonic x data are not decimated. Default
+            is None (no decimation).
+        decimate_dpi : float, optional
+            Resolution in dots per inch used to find the number of columns across the axes when
+            decimating lines. Default is 300.
+        rasterize : int, optional
+            Lines and collections (e.g. scatter plots and meshes) with at least this many vertices
+            and markers are drawn as images in vector output, at a resolution set by `shape`
+            (600, 400 and 300 dpi for 'single', 'double' and 'large'). Axes, text and lighter
+            artists stay vector, so the size of PDF and SVG files is bounded regardless of the
+            amount of data. Default is None, which draws every artist as vectors.
+        layout : str, optional
+            'fixed' positions the axes so all text fits inside the figure at its `shape` size, and
+            `write_pdf`/`write_svg` then write the figure in a single draw with a page size equal
+            to the figure size. Artists added after formatting (e.g. a legend outside of the axes)
+            are not included in a fixed layout and may be cut off. 'tight' keeps the axes position
+            and the writers crop the page to the tight bounding box of the figure. Default is
+            'tight'.
+        consolidate : bool, optional
+            Draw lines that share a style and label as a single `LineCollection`, which is much
+            faster to draw and write for figures with many lines such as parameter sweeps. The
+            original lines are hidden and kept on the axes, and each collection takes the label of
+            its lines for legends. Lines with markers or step drawstyles are not consolidated.
+            Default is `False`.
+        live : bool, optional
+            Live mode for figures whose lines have points appended between calls, e.g. monitoring
+            dashboards. The running data extent of each line is kept, so the axis limits are
+            updated by scanning only the new points, and limits and ticks are only changed (and
+            redrawn) when they differ from the previous call. Points already plotted must not be
+            modified. Default is `False`.
+        force : bool, optional
+            Formatting stages already applied to the figure with the same options and data are
+            skipped, so formatting a figure again is cheap and does not add duplicate artists. If
+            `True` all stages are re-applied. Default is `False`.
 
         Returns
         -------
         figure : matplotlib.pyplot.Figure
             matplotlib `Figure` object with formatting applied.
-        axes : matplotlib.plyplot.Axes
-            matplotlib `Axes` object with formatting applied.
+        axes : matplotlib.plyplot.Axes or list
+            matplotlib `Axes` object with formatting applied, or the list of axes of a grid.
         '''
 
 
         kwargs = self._parse_input(figure, **kwargs)
-        self._format_fig_size(**kwargs)
-        self._format_axes_labels(**kwargs)
-        self._format_ticks(**kwargs)
-        self._format_line_colors(**kwargs)
-        self._format_line_annotation(**kwargs)
-        self._format_axes_limits(**kwargs)
-        self._format_axes_scale(**kwargs)
-        self._format_grid(**kwargs)
-        self._format_tight_layout(**kwargs)
-        self._display(**kwargs)
+        self._run_stages(**kwargs)
 
         return self.figure, self.axes
 
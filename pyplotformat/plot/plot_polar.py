@@ -1,13 +1,12 @@
 '''
 Format class for polar plots.
 '''
-from matplotlib import pyplot as plt
-import matplotlib.ticker as mticker
+from matplotlib.figure import Figure
+from matplotlib.axes import Axes
 
-from .format import Format
+from .format import Format, _set_limits
 from .default_values import _default_polar_format_opts
 
-from math import pi
 import numpy as np
 
 class FormatPolar(Format):
@@ -28,6 +27,12 @@ class FormatPolar(Format):
         attribute of the class. (default value is 10.0)
     saveloc : str, optional
         Directory location for plot objects to be saved to. (default value is '.')
+    profile : bool, optional
+        If `True` the wall time of each formatting stage is recorded in the `stats` attribute
+        after every call. (default value is `False`)
+    hook : callable, optional
+        Function called with the `FormatStats` of every call, e.g. to send them to a metrics
+        pipeline. Setting a hook enables profiling. (default value is None)
 
     Attributes
     ----------
@@ -40,6 +45,8 @@ class FormatPolar(Format):
         attribute of the class.
     saveloc : str
         Directory location for plot objects to be saved to.
+    stats : FormatStats
+        Stage timings of the last call if profiling is enabled, otherwise None.
     SMALL_SIZE : float
         Size for small font text, equals 0.8*fontsize
     MEDIUM_SIZE : float
@@ -47,32 +54,66 @@ class FormatPolar(Format):
     LARGE_SIZE : float
         Size fot large plot text, equals 1.2*fontsize
     defaultfont : Dict
-        Matplotlib kwargs dict for font. Describes default font family and size
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for default text
     axesfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes labels
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes labels
     titlefont : Dict
-        Matplotlib kwargs dict for font. Describes font for title.
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for the title.
     tickfont : Dict
-        Matplotlib kwargs dict for font. Describes font for axes ticks
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for axes ticks
     legendfont : Dict
-        Matplotlib kwargs dict for font. Describes font for legends
+        Matplotlib kwargs dict for font. Holds the cached `FontProperties` for legends
     '''
     # pylint: disable=too-few-public-methods
     # Only need the __call__ method for this class
     # May add other set_ and get_ methods at a later date
 
+    _stages = ("_format_polar_options",
+               "_format_fig_size",
+               "_format_axes_limits",
+               "_format_ticks",
+               "_format_axes_labels",
+               "_format_line_colors",
+               "_format_line_annotation",
+               "_format_axes_scale",
+               "_format_rasterization",
+               "_format_tight_layout",
+               "_display")
+
+    _stage_keys = { "_format_polar_options":    ("axis_shape", "orient", "zero_location"),
+                    "_format_fig_size":         (),
+                    "_format_axes_limits":      ("rlim", "lypad", "uypad", "data"),
+                    "_format_ticks":            ("_format_polar_options", "_format_fig_size",
+                                                 "_format_axes_limits"),
+                    "_format_axes_labels":      ("tlabel", "rlabel", "title", "axis_shape",
+                                                 "_format_axes_limits", "_format_ticks"),
+                    "_format_line_colors":      ("color", "palette", "blackline", "data"),
+                    "_format_line_annotation":  ("annotate", "shortlabel", "data",
+                                                 "_format_fig_size", "_format_line_colors",
+                                                 "_format_axes_limits"),
+                    "_format_axes_scale":       ("xscale", "yscale"),
+                    "_format_rasterization":    ("rasterize", "data"),
+                    "_format_tight_layout":     ("layout", "_format_fig_size",
+                                                 "_format_axes_labels", "_format_line_annotation",
+                                                 "_format_ticks"),
+                    }
+
+    _artist_stages = ("_format_axes_labels", "_format_line_annotation")
+
     def __init__(self,
                  shape : str = "single",
                  fontsize : int = 10,
-                 saveloc : str = ".") -> None:
+                 saveloc : str = ".",
+                 profile : bool = False,
+                 hook = None) -> None:
 
-        super().__init__(shape, fontsize, saveloc)
+        super().__init__(shape, fontsize, saveloc, profile, hook)
         self.default_format_opts = _default_polar_format_opts
 
     def __call__(self,
-                figure : plt.Figure,
+                figure : Figure,
                 **kwargs : dict
-                ) -> tuple[plt.Figure, plt.Axes]:
+                ) -> tuple[Figure, Axes]:
         '''Format a polar figure according to class attributes and specified or default parameters.
 
         Format a matplotlib 2D (cartesian axis) figure containing an axes object with data already 
@@ -81,7 +122,10 @@ class FormatPolar(Format):
         Parameters
         ----------
         figure : matplotlib.pyplot.Figure
-            Matplotlib `Figure` object containing a single axes with data plotted.
+            Matplotlib `Figure` object containing a single axes or a grid of subplots with data
+            plotted. Each axes of a grid is formatted with the same options, axes with shared x or
+            y axes are given the same limits and ticks, axis labels are only set on the outer axes
+            of the grid and the title becomes the figure title.
         **kwargs : dict, optional
             Extra arguments that can be supplied to modify formatting. See :ref:'Other Parameters'
         
@@ -105,10 +149,15 @@ class FormatPolar(Format):
             If `True` will show the plot before it is returned using `matplotlib.pyplot.show()`
         color : list, optional
             List of colors defined by strings (either matplotlib aliases or hex codes) with a 
-            length equal to the number of lines. This can be used to override the default color
-            scheme. A subset of lines can keep the default color scheme by leaving the 
+            length equal to the number of lines of each axes. This can be used to override the
+            default color scheme. A subset of lines can keep the default color scheme by leaving the
             corresponding list position with a value of `None`. (default value is `None`, which
             uses default color scheme)
+        palette : str or list, optional
+            Colors used for the lines that are not overridden by `color`, in order. Either the name
+            of a matplotlib colormap (e.g. 'viridis'), which is sampled evenly across the lines, or
+            a list of colors, which is repeated when there are more lines than colors. (default
+            value is None, which repeats the default color scheme)
         shortlabel : list, optional
             List of strings that can be placed at the rightmost edge of each line to help define
             it. This label will replace the legend handle. Useful for plots that do not use color
@@ -130,27 +179,41 @@ class FormatPolar(Format):
             line. (default value is 1.1)
         rscale : str, optional
             Scale for the r-axis using matplotlib settings. (default value is None)
+        rasterize : int, optional
+            Lines and collections (e.g. scatter plots and meshes) with at least this many vertices
+            and markers are drawn as images in vector output, at a resolution set by `shape`
+            (600, 400 and 300 dpi for 'single', 'double' and 'large'). Axes, text and lighter
+            artists stay vector, so the size of PDF and SVG files is bounded regardless of the
+            amount of data. Default is None, which draws every artist as vectors.
+        layout : str, optional
+            'fixed' positions the axes so all text fits inside the figure at its `shape` size, and
+            `write_pdf`/`write_svg` then write the figure in a single draw with a page size equal
+            to the figure size. Artists added after formatting (e.g. a legend outside of the axes)
+            are not included in a fixed layout and may be cut off. 'tight' keeps the axes position
+            and the writers crop the page to the tight bounding box of the figure. Default is
+            'tight'.
+        live : bool, optional
+            Live mode for figures whose lines have points appended between calls, e.g. monitoring
+            dashboards. The running data extent of each line is kept, so the axis limits are
+            updated by scanning only the new points, and limits and ticks are only changed (and
+            redrawn) when they differ from the previous call. Points already plotted must not be
+            modified. Default is `False`.
+        force : bool, optional
+            Formatting stages already applied to the figure with the same options and data are
+            skipped, so formatting a figure again is cheap and does not add duplicate artists. If
+            `True` all stages are re-applied. Default is `False`.
         
         Returns
         -------
         figure : matplotlib.pyplot.Figure
             matplotlib `Figure` object with formatting applied.
-        axes : matplotlib.plyplot.Axes
-            matplotlib `Axes` object with formatting applied.
+        axes : matplotlib.plyplot.Axes or list
+            matplotlib `Axes` object with formatting applied, or the list of axes of a grid.
         '''
         
 
         kwargs = self._parse_input(figure, **kwargs)
-        self._format_polar_options(**kwargs)
-        self._format_fig_size(**kwargs)
-        self._format_axes_limits(**kwargs)
-        self._format_ticks(**kwargs)
-        self._format_axes_labels(**kwargs)
-        self._format_line_colors(**kwargs)
-        self._format_line_annotation(**kwargs)
-        self._format_axes_scale(**kwargs)
-        self._format_tight_layout(**kwargs)
-        self._display(**kwargs)
+        self._run_stages(**kwargs)
 
         return self.figure, self.axes
 
@@ -192,9 +255,9 @@ class FormatPolar(Format):
 
         # Set label and titles
         # =========================================================================================
-        if kwargs['tlabel'] is not None:
+        if kwargs['tlabel'] is not None and self._is_outer("bottom"):
             self.axes.set_xlabel(kwargs['tlabel'], **self.axesfont)
-        if kwargs['rlabel'] is not None:
+        if kwargs['rlabel'] is not None and self._is_outer("left"):
             
             rax_mid_point = self.axes.get_rmin() + (self.axes.get_rmax() - self.axes.get_rmin())/2
 
@@ -208,7 +271,7 @@ class FormatPolar(Format):
 
             #self.axes.set_ylabel(kwargs['rlabel'], **self.axesfont)
         if kwargs['title'] is not None:
-            self.axes.set_suptitle(kwargs['title'], **self.titlefont)
+            self._set_title(kwargs['title'])
 
 
     def _format_ticks(self,
@@ -216,25 +279,13 @@ class FormatPolar(Format):
 
         # Set tick formatting
         # =========================================================================================
-        ticks_loc = self.axes.get_xticks().tolist()
-        self.axes.xaxis.set_major_locator(mticker.FixedLocator(ticks_loc))
-
-        ticks_loc = self.axes.get_yticks()
-        self.axes.yaxis.set_major_locator(mticker.FixedLocator(ticks_loc))
-
-        self.axes.set_xticklabels(["{:.5g}°".format(tick*180/pi) for tick in self.axes.get_xticks()]\
-                                , **self.tickfont)
-        self.axes.set_yticklabels(self.axes.get_yticks(), **self.tickfont)
-        self.axes.yaxis.set_major_formatter('{x:.5g}')
-
+        tplan = self._shared_tick_plan(self.axes.xaxis, fmt=_degree_label)
+        rplan = self._shared_tick_plan(self.axes.yaxis)
 
-        ticks_loc = self.axes.get_yticks()
-        
-        for tick in ticks_loc:
-            self.axes.text(np.radians(0.0), tick, '{:.5g}'.format(tick),
-                rotation=0.0,ha='center',va='top', **self.axesfont)
+        self._apply_tick_plans((tplan, rplan), kwargs['live'])
 
-        self.axes.set_yticklabels([], **self.tickfont)
+        # Radial labels are drawn by the axis formatter along the zero angle
+        self.axes.set_rlabel_position(0.0)
 
         self.axes.grid(linestyle=":", linewidth=0.7)
     
@@ -246,20 +297,15 @@ class FormatPolar(Format):
         # =========================================================================================
 
         if kwargs['rlim'] is None:
-            rmin = 1e20
-            rmax = 1e-20
-            ymin = 1e20
-            ymax = -1e20
-            for line in self.axes.get_lines():
-                # Remove None data for comparison
-                y_data = [y for y in line.get_ydata() if y is not None]
-                if min(y_data) < ymin:
-                    ymin = min(y_data)
-                if max(y_data) > ymax:
-                    ymax = max(y_data)
-
-
-            self.axes.set_ylim(kwargs['lypad']*ymin, kwargs['uypad']*ymax)
+            extent = self._shared_extent(kwargs['live'])
+            if extent.valid_y:
+                _set_limits(self.axes.get_ylim, self.axes.set_ylim,
+                            kwargs['lypad']*extent.ymin, kwargs['uypad']*extent.ymax)
         else:
-            self.axes.set_ylim(kwargs['rlim'][0], kwargs['rlim'][1])
+            _set_limits(self.axes.get_ylim, self.axes.set_ylim, *kwargs['rlim'][0:2])
                 
+
+
+def _degree_label(tick) -> str:
+
+    return "{:.5g}°".format(np.degrees(tick))
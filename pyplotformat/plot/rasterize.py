@@ -0,0 +1,98 @@
+'''
+This module contains the rasterization policy used by the format classes.
+
+Vector output (PDF, SVG) stores every vertex and marker of every artist, so scatter clouds and
+dense meshes with millions of points give very large files that are slow to write and to open.
+Artists with more vertices or markers than a threshold are marked as `rasterized`, so the vector
+backends draw them as an image at the raster dpi of the figure shape. Axes, text and light lines
+stay vector, and the output size is bounded by the image size rather than the data volume.
+'''
+
+import numpy as np
+from matplotlib.collections import Collection, QuadMesh
+
+from .default_values import _raster_dpi, _fallback_raster_dpi
+
+
+def raster_dpi(shape) -> int:
+    '''Resolution used for rasterized artists of a figure shape.
+
+    Parameters
+    ----------
+    shape : str
+        Figure shape, 'single', 'double' or 'large'.
+
+    Returns
+    -------
+    dpi : int
+        Resolution in dots per inch. Chosen so a raster covering the whole figure has about 3
+        million pixels for every shape.
+    '''
+    return _raster_dpi.get(shape, _fallback_raster_dpi)
+
+
+def artist_weight(artist) -> int:
+    '''Number of vertices and markers drawn for an artist.
+
+    Parameters
+    ----------
+    artist : matplotlib.artist.Artist
+        Line or collection.
+
+    Returns
+    -------
+    weight : int
+        Number of points of a line, or the number of offsets (e.g. scatter markers) plus the
+        number of path vertices of a collection. Zero for other artists.
+    '''
+    if hasattr(artist, "get_xydata"):
+        return len(artist.get_xydata())
+
+    if isinstance(artist, QuadMesh):
+        # Paths of a mesh are only created when drawn
+        return int(np.prod(artist.get_coordinates().shape[:2]))
+
+    if isinstance(artist, Collection):
+        return len(artist.get_offsets()) + sum(len(path.vertices) for path in artist.get_paths())
+
+    return 0
+
+
+def rasterize_artists(axes, threshold) -> list:
+    '''Mark the heavy lines and collections of an axes as rasterized.
+
+    Hidden artists, and artists the user already marked as rasterized, are not changed.
+
+    Parameters
+    ----------
+    axes : matplotlib.axes.Axes
+        Axes containing the artists.
+    threshold : int
+        Minimum number of vertices and markers (see `artist_weight`) of a rasterized artist.
+
+    Returns
+    -------
+    rasterized : list
+        Artists marked as rasterized, see `vectorize_artists`.
+    '''
+    rasterized = []
+    for artist in [*axes.get_lines(), *axes.collections]:
+        if not artist.get_visible() or artist.get_rasterized():
+            continue
+        if artist_weight(artist) >= threshold:
+            artist.set_rasterized(True)
+            rasterized.append(artist)
+
+    return rasterized
+
+
+def vectorize_artists(artists) -> None:
+    '''Draw the artists marked by `rasterize_artists` as vectors again.
+
+    Parameters
+    ----------
+    artists : list
+        Artists returned by `rasterize_artists`.
+    '''
+    for artist in artists:
+        artist.set_rasterized(False)
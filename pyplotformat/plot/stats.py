@@ -0,0 +1,65 @@
+'''
+This module contains the timing statistics recorded by format objects when profiling is enabled.
+'''
+
+import time
+
+
+class FormatStats():
+    '''Wall time of each stage of a single formatting call.
+
+    Stages are named after the formatter method without the `_format_` prefix (e.g. 'axes_limits').
+    Writer functions such as `write_pdf` add a 'savefig' stage when given the stats object.
+
+    Attributes
+    ----------
+    formatter : str
+        Name of the format class that recorded the stats.
+    stages : dict
+        Wall time in seconds of each stage, in the order the stages were run.
+    '''
+
+    def __init__(self, formatter : str = "") -> None:
+        self.formatter = formatter
+        self.stages = {}
+
+    def __repr__(self) -> str:
+        stages = ", ".join("{}={:.4g}s".format(k, v) for k, v in self.stages.items())
+        return "FormatStats({}: {})".format(self.formatter, stages)
+
+    @property
+    def total(self) -> float:
+        '''Total wall time of all stages in seconds.'''
+        return sum(self.stages.values())
+
+    def add(self, stage : str, seconds : float) -> None:
+        '''Add wall time to a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        seconds : float
+            Wall time in seconds.
+        '''
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        '''Stats as a flat dict, suitable for a metrics pipeline.'''
+        return {"formatter": self.formatter, "total": self.total, **self.stages}
+
+
+def _stage_name(method : str) -> str:
+
+    return method[len("_format_"):] if method.startswith("_format_") else method.lstrip("_")
+
+
+def _timed(stats, stage, function, *args, **kwargs):
+
+    # Run function and add its wall time to the stage
+    # =============================================================================================
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        stats.add(stage, time.perf_counter() - start)
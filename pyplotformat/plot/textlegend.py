@@ -4,6 +4,8 @@ Replaces default legend handle with a text handle.
 
 import matplotlib.text as mpl_text
 
+from .fonts import role_font
+
 class TextLegend():
     '''
     Container for text legend handle.
@@ -53,7 +55,7 @@ class TextLegendHandler():
         patch = mpl_text.Text(x=0, y=0, text=orig_handle.my_text + " " + "\u2014",
                               color=orig_handle.my_color, verticalalignment='baseline',
                                 horizontalalignment='left', multialignment=None,
-                                fontproperties=None, linespacing=None,
-                                rotation_mode=None, size=fontsize, family="Times New Roman")
+                                fontproperties=role_font("legend", fontsize), linespacing=None,
+                                rotation_mode=None)
         handlebox.add_artist(patch)
         return patch
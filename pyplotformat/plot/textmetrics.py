@@ -0,0 +1,179 @@
+'''
+This module contains the process-wide text metrics cache shared by all format classes.
+
+Text is measured with an Agg renderer at 72 dpi, so sizes are in points, and the result is cached
+by the text, its font, size and rotation. The same strings (tick labels, axis labels shared by a
+batch, legend labels) are measured once per process instead of once per figure. Layout decisions
+such as the number of legend columns can then be made without rendering the figure, and layout
+measurements that need a renderer use `cached_renderer` to read text sizes from the cache.
+'''
+
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib import cbook
+from matplotlib.backends.backend_agg import RendererAgg
+
+# Measuring at 72 dpi gives sizes in points
+_METRICS_DPI = 72
+
+_DEFAULT_MAX_ENTRIES = 4096
+
+
+class TextMetricsCache():
+    '''Least recently used cache of text sizes.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of cached entries. (default value is 4096)
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of cached entries.
+    hits : int
+        Number of measurements read from the cache.
+    misses : int
+        Number of measurements made with the renderer.
+    '''
+
+    def __init__(self, maxsize : int = _DEFAULT_MAX_ENTRIES) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._renderer = None
+
+    def __repr__(self) -> str:
+        return "TextMetricsCache(size={}, maxsize={}, hits={}, misses={})".format(
+            len(self), self.maxsize, self.hits, self.misses)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        '''Remove all entries and reset the counters.'''
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def measure(self, text, fontproperties, rotation : float = 0.0,
+                ismath = None) -> tuple[float, float, float]:
+        '''Get the size of a single line of text.
+
+        Parameters
+        ----------
+        text : str
+            Text to measure.
+        fontproperties : matplotlib.font_manager.FontProperties
+            Font of the text, e.g. a cached font from `role_font`. It must not be modified after
+            it is measured.
+        rotation : float, optional
+            Rotation of the text in degrees. (default value is 0.0)
+        ismath : bool or str, optional
+            Passed to the renderer. (default value is None, which detects mathtext from the text)
+
+        Returns
+        -------
+        width : float
+            Width of the bounding box of the rotated text in points.
+        height : float
+            Height of the bounding box of the rotated text in points.
+        descent : float
+            Descent of the unrotated text below its baseline in points.
+        '''
+        if ismath is None:
+            ismath = cbook.is_math_text(text)
+
+        key = (text, fontproperties, fontproperties.get_size_in_points(), float(rotation), ismath)
+
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        if self._renderer is None:
+            self._renderer = RendererAgg(1, 1, _METRICS_DPI)
+
+        width, height, descent = self._renderer.get_text_width_height_descent(
+            text, fontproperties, ismath=ismath)
+
+        if rotation:
+            angle = np.radians(rotation)
+            width, height = (abs(width*np.cos(angle)) + abs(height*np.sin(angle)),
+                             abs(width*np.sin(angle)) + abs(height*np.cos(angle)))
+
+        self._entries[key] = (float(width), float(height), float(descent))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return self._entries[key]
+
+
+# Cache shared by all format classes
+text_metrics = TextMetricsCache()
+
+
+def text_size(text, fontproperties, rotation : float = 0.0) -> tuple[float, float]:
+    '''Get the size of a single line of text from the shared cache.
+
+    Parameters
+    ----------
+    text : str
+        Text to measure.
+    fontproperties : matplotlib.font_manager.FontProperties
+        Font of the text. It must not be modified after it is measured.
+    rotation : float, optional
+        Rotation of the text in degrees. (default value is 0.0)
+
+    Returns
+    -------
+    width : float
+        Width of the text in points.
+    height : float
+        Height of the text in points.
+    '''
+    return text_metrics.measure(text, fontproperties, rotation)[:2]
+
+
+class _CachedRenderer():
+    '''Renderer wrapper reading text sizes from the shared cache.'''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, renderer) -> None:
+        self._renderer = renderer
+
+    def __getattr__(self, name):
+        return getattr(self._renderer, name)
+
+    def get_text_width_height_descent(self, s, prop, ismath):
+        '''Size of the text in pixels, measured once per process.'''
+        if ismath == "TeX":
+            return self._renderer.get_text_width_height_descent(s, prop, ismath)
+
+        scale = self._renderer.points_to_pixels(1.0)
+        width, height, descent = text_metrics.measure(s, prop, ismath=ismath)
+
+        return width*scale, height*scale, descent*scale
+
+
+def cached_renderer(renderer):
+    '''Wrap a renderer so layout measurements read text sizes from the shared cache.
+
+    The wrapped renderer must only be used to measure the figure, e.g. with `get_tightbbox`, not
+    to draw it.
+
+    Parameters
+    ----------
+    renderer : matplotlib.backend_bases.RendererBase
+        Renderer of the figure.
+
+    Returns
+    -------
+    renderer : object
+        Renderer with cached text measurements.
+    '''
+    return _CachedRenderer(renderer)
@@ -0,0 +1,174 @@
+'''
+This module contains the tick planning methods used by the format classes.
+
+A tick plan holds the major tick locations and formatted labels of an axis. It is computed once
+after the axis limits and scale are final and applied in a single step, instead of repeatedly
+running the axis locator and formatter. Plans for the default locators are cached by the locator
+parameters, so figures that share identical limits and locator settings reuse the same plan.
+
+Applying a plan fixes the tick locations, the locator it replaces is kept so later plans (e.g.
+after the limits change) are computed from the original locator again.
+'''
+
+from collections import OrderedDict
+
+import matplotlib.ticker as mticker
+import numpy as np
+
+_MAX_CACHED_PLANS = 256
+
+_plan_cache = OrderedDict()
+
+
+class _PlanLocator(mticker.FixedLocator):
+
+    # Fixed locator of an applied plan, holding the locator it replaced
+    # =============================================================================================
+    def __init__(self, locations, source) -> None:
+        super().__init__(locations)
+        self.source = source
+
+
+def _source_locator(axis):
+
+    # Locator the ticks of an axis are planned with, the locator replaced by an applied plan. The
+    # scale of an axis installs new default locators when it changes, which are used instead
+    # =============================================================================================
+    locator = axis.get_major_locator()
+    if isinstance(locator, _PlanLocator):
+        return locator.source
+
+    return locator
+
+
+class TickPlan():
+    '''Major tick locations and labels for an axis.
+
+    Attributes
+    ----------
+    locations : tuple
+        Major tick locations in data coordinates.
+    labels : tuple
+        Formatted label for each tick location.
+    '''
+    # pylint: disable=too-few-public-methods
+    # This class format is just for data storage
+
+    def __init__(self, locations, labels) -> None:
+        self.locations = tuple(locations)
+        self.labels = tuple(labels)
+
+    def __repr__(self) -> str:
+        return "TickPlan({})".format(", ".join(self.labels))
+
+    def apply(self, axis, fontproperties=None) -> None:
+        '''Apply the plan to an axis.
+
+        Parameters
+        ----------
+        axis : matplotlib.axis.Axis
+            Axis to apply the tick locations and labels to.
+        fontproperties : matplotlib.font_manager.FontProperties, optional
+            Font for the tick labels. (default value is None, which keeps the current font)
+        '''
+        axis.set_major_locator(_PlanLocator(self.locations, _source_locator(axis)))
+        axis.set_major_formatter(mticker.FixedFormatter(self.labels))
+
+        if fontproperties is not None:
+            for tick in axis.get_major_ticks(len(self.locations)):
+                tick.label1.set_fontproperties(fontproperties)
+                tick.label2.set_fontproperties(fontproperties)
+
+
+def _hashable_param(value):
+
+    # Locator parameters such as the steps of a MaxNLocator can be arrays or lists
+    # =============================================================================================
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return tuple(np.asarray(value, dtype=object).ravel().tolist())
+
+    return value
+
+
+def _locator_params(locator):
+
+    # Parameters of a locator (e.g. nbins, steps, base and subs), None if they are not hashable
+    # =============================================================================================
+    params = tuple(sorted((name, _hashable_param(value)) for name, value in vars(locator).items()
+                          if name != "axis"))
+    try:
+        hash(params)
+    except TypeError:
+        return None
+
+    return params
+
+
+def _locator_key(axis):
+
+    # Only the default locators are fully described by the axis state and their parameters,
+    # others are not cached
+    # =============================================================================================
+    locator = _source_locator(axis)
+
+    if type(locator) is mticker.AutoLocator: # pylint: disable=unidiomatic-typecheck
+        kind = ("auto",)
+    elif type(locator) is mticker.LogLocator: # pylint: disable=unidiomatic-typecheck
+        kind = ("log", axis.get_scale())
+    else:
+        return None
+
+    params = _locator_params(locator)
+    if params is None:
+        return None
+
+    return kind + (params, axis.get_tick_space())
+
+
+def plan_ticks(axis, locations=None, fmt="{:.5g}") -> TickPlan:
+    '''Compute the tick plan for an axis with its current limits and scale.
+
+    Parameters
+    ----------
+    axis : matplotlib.axis.Axis
+        Axis to plan ticks for.
+    locations : list, optional
+        Manual tick locations. (default value is None, which uses the axis locator, or the
+        locator replaced by the last applied plan)
+    fmt : str or callable, optional
+        Format string applied to each tick location, or a function that takes a tick location
+        and returns its label. (default value is '{:.5g}')
+
+    Returns
+    -------
+    plan : TickPlan
+        Tick locations and labels.
+    '''
+    if locations is not None:
+        locations = tuple(locations)
+        key = ("fixed", locations, fmt)
+    else:
+        key = _locator_key(axis)
+        if key is not None:
+            key = key + (tuple(axis.get_view_interval()), fmt)
+
+    if key is not None and key in _plan_cache:
+        _plan_cache.move_to_end(key)
+        return _plan_cache[key]
+
+    if locations is None:
+        locations = _source_locator(axis)()
+
+    if callable(fmt):
+        labels = [fmt(loc) for loc in locations]
+    else:
+        labels = [fmt.format(loc) for loc in locations]
+
+    plan = TickPlan(locations, labels)
+
+    if key is not None:
+        _plan_cache[key] = plan
+        if len(_plan_cache) > _MAX_CACHED_PLANS:
+            _plan_cache.popitem(last=False)
+
+    return plan
@@ -6,7 +6,7 @@ import codecs
 with open("README.md") as file:
     long_description = file.read()
 
-REQUIREMENTS = ['matplotlib', 'pypdf']
+REQUIREMENTS = ['matplotlib>=3.6']
 
 CLASSIFIERS = [
 'Programming Language :: Python :: 3.9'
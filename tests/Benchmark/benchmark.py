@@ -0,0 +1,268 @@
+'''
+Benchmark suite for the pyplotformat formatters and I/O functions.
+
+Each case is run on figures with a range of line counts and points per line. The wall time, peak
+Python memory (numpy allocations included) and output file size are recorded for each run. Peak
+memory is traced in a separate run so tracing does not affect the wall time.
+
+Usage
+-----
+    python benchmark.py                         # quick preset
+    python benchmark.py --preset full           # 100 to 10M points, 1 to 500 lines
+    python benchmark.py --cases format2d write_pdf --points 1000 100000 --lines 1 50
+    python benchmark.py --output new.csv --baseline old.csv
+
+Results can be written to a CSV file with `--output` and compared against a previous run with
+`--baseline`, which reports the time and memory ratio of each matching run.
+'''
+
+import argparse
+import csv
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+import pyplotformat as ppf
+from pyplotformat.plot import Format2D, FormatPolar, FormatLegend
+from pyplotformat.io import write_pdf, save_figure, load_figure
+from pyplotformat.io.write import write_svg
+from pyplotformat.io.inkscaper import _write_figure_package
+
+PRESETS = { "quick":    {"points": [100, 10_000, 1_000_000], "lines": [1, 10, 100]},
+            "full":     {"points": [100, 10_000, 1_000_000, 10_000_000],
+                         "lines": [1, 10, 100, 500]},
+            }
+
+FIELDS = ["case", "lines", "points", "time_s", "peak_mb", "size_kb"]
+
+
+def build_2d(n_lines, n_points):
+    '''Create a 2D figure with `n_lines` labelled lines of `n_points` points.'''
+    fig, ax = ppf.new_figure()
+    x = np.linspace(0.0, 10.0, n_points)
+    for ii in range(n_lines):
+        ax.plot(x, np.sin(x + 0.1*ii) + 0.01*ii, label="line {}".format(ii))
+    return fig
+
+
+def build_polar(n_lines, n_points):
+    '''Create a polar figure with `n_lines` labelled lines of `n_points` points.'''
+    fig, ax = ppf.new_figure(subplot_kw={"projection": "polar"})
+    th = np.linspace(0.0, np.pi, n_points)
+    for ii in range(n_lines):
+        ax.plot(th, 1.0 + np.sin(th)**2 + 0.01*ii, label="line {}".format(ii))
+    return fig
+
+
+def formatted_2d(n_lines, n_points):
+    '''Create a 2D figure and format it with the default options.'''
+    fig = build_2d(n_lines, n_points)
+    Format2D()(fig, xlabel="x", ylabel="y")
+    return fig
+
+
+def _file_size(path):
+    return os.path.getsize(path)/1024 if os.path.exists(path) else float("nan")
+
+
+# Each case takes (n_lines, n_points, tmpdir). It returns a (setup, run) pair, where setup builds
+# the inputs outside of the timed region and run(inputs) returns an output path or None.
+# =================================================================================================
+
+def case_format2d(n_lines, n_points, tmpdir):
+
+    def run(fig):
+        Format2D()(fig, xlabel="x", ylabel="y")
+
+    return lambda: build_2d(n_lines, n_points), run
+
+
+def case_formatpolar(n_lines, n_points, tmpdir):
+
+    def run(fig):
+        FormatPolar()(fig, rlabel="r")
+
+    return lambda: build_polar(n_lines, n_points), run
+
+
+def case_legend(n_lines, n_points, tmpdir):
+
+    def run(fig):
+        FormatLegend()(fig)
+
+    return lambda: build_2d(n_lines, n_points), run
+
+
+def case_write_pdf(n_lines, n_points, tmpdir):
+    path = Path(tmpdir)/"figure.pdf"
+
+    def run(fig):
+        write_pdf(fig, path)
+        return path
+
+    return lambda: formatted_2d(n_lines, n_points), run
+
+
+def case_write_svg(n_lines, n_points, tmpdir):
+    path = Path(tmpdir)/"figure.svg"
+
+    def run(fig):
+        write_svg(fig, path)
+        return path
+
+    return lambda: formatted_2d(n_lines, n_points), run
+
+
+def case_save_figure(n_lines, n_points, tmpdir):
+    path = Path(tmpdir)/"figure.fig"
+
+    def run(fig):
+        save_figure(path, fig, fig.get_axes()[0])
+        return path
+
+    return lambda: formatted_2d(n_lines, n_points), run
+
+
+def case_load_figure(n_lines, n_points, tmpdir):
+    path = Path(tmpdir)/"figure.fig"
+
+    def setup():
+        fig = formatted_2d(n_lines, n_points)
+        save_figure(path, fig, fig.get_axes()[0])
+
+    def run(_):
+        load_figure(path)
+        return path
+
+    return setup, run
+
+
+def case_figure_package(n_lines, n_points, tmpdir):
+
+    def run(figs):
+        return Path(_write_figure_package(figs, directory=tmpdir))
+
+    return lambda: [formatted_2d(n_lines, n_points) for _ in range(4)], run
+
+
+CASES = {   "format2d":         case_format2d,
+            "formatpolar":      case_formatpolar,
+            "legend":           case_legend,
+            "write_pdf":        case_write_pdf,
+            "write_svg":        case_write_svg,
+            "save_figure":      case_save_figure,
+            "load_figure":      case_load_figure,
+            "figure_package":   case_figure_package,
+            }
+
+
+def _run_once(name, n_lines, n_points, trace):
+
+    # Run a case on new inputs. Only the run itself is timed or traced, tracemalloc slows down
+    # allocations so time and peak memory are measured in separate runs
+    # =============================================================================================
+    with tempfile.TemporaryDirectory() as tmpdir:
+        setup, run = CASES[name](n_lines, n_points, tmpdir)
+        inputs = setup()
+        gc.collect()
+
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        output = run(inputs)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+
+        size = _file_size(output) if output is not None else float("nan")
+
+    return elapsed, peak, size
+
+
+def run_case(name, n_lines, n_points, repeat):
+    '''Run a single benchmark case and return the best time of `repeat` runs.
+
+    The peak memory is measured in one extra run with `tracemalloc` enabled, so the recorded
+    times are not affected by tracing.
+    '''
+    best_time, size = None, None
+    for _ in range(repeat):
+        elapsed, _, size = _run_once(name, n_lines, n_points, trace=False)
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+    _, peak, _ = _run_once(name, n_lines, n_points, trace=True)
+
+    return {"case": name, "lines": n_lines, "points": n_points,
+            "time_s": best_time, "peak_mb": peak/2**20, "size_kb": size}
+
+
+def read_baseline(filename):
+    '''Read a previous results CSV into a dict keyed by (case, lines, points).'''
+    with open(filename, newline="") as in_file:
+        return {(row["case"], int(row["lines"]), int(row["points"])): row
+                for row in csv.DictReader(in_file)}
+
+
+def main():
+    '''Run the benchmark suite from the command line.'''
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--preset", choices=PRESETS, default="quick")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--points", nargs="+", type=int, help="Points per line")
+    parser.add_argument("--lines", nargs="+", type=int, help="Lines per figure")
+    parser.add_argument("--max-total", type=float, default=5e7,
+                        help="Skip runs with more than this many points in total")
+    parser.add_argument("--repeat", type=int, default=1, help="Report the best of N runs")
+    parser.add_argument("--output", help="Write results to a CSV file")
+    parser.add_argument("--baseline", help="Compare against a previous results CSV file")
+    args = parser.parse_args()
+
+    ppf.use_headless()
+
+    points = args.points or PRESETS[args.preset]["points"]
+    lines = args.lines or PRESETS[args.preset]["lines"]
+    baseline = read_baseline(args.baseline) if args.baseline else {}
+
+    header = "{:<15} {:>6} {:>10} {:>10} {:>10} {:>10}".format(*FIELDS)
+    if baseline:
+        header += " {:>8} {:>8}".format("t_ratio", "m_ratio")
+    print(header)
+
+    results = []
+    for name in args.cases:
+        for n_lines in lines:
+            for n_points in points:
+                if n_lines*n_points > args.max_total:
+                    continue
+                try:
+                    result = run_case(name, n_lines, n_points, args.repeat)
+                except Exception as err: # pylint: disable=broad-except
+                    print("{:<15} {:>6} {:>10} failed: {!r}".format(name, n_lines, n_points, err))
+                    continue
+                results.append(result)
+
+                row = "{case:<15} {lines:>6} {points:>10} {time_s:>10.4f} {peak_mb:>10.2f} "\
+                      "{size_kb:>10.1f}".format(**result)
+                old = baseline.get((name, n_lines, n_points))
+                if old is not None:
+                    row += " {:>8.2f} {:>8.2f}".format(
+                        result["time_s"]/max(float(old["time_s"]), 1e-12),
+                        result["peak_mb"]/max(float(old["peak_mb"]), 1e-12))
+                print(row, flush=True)
+
+    if args.output:
+        with open(args.output, "w", newline="") as out_file:
+            writer = csv.DictWriter(out_file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+'''
+Round trip and recovery tests for the binary figure archive.
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib import colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.path import Path as MplPath
+
+from pyplotformat.io import FigureArchive, load_figure, save_figure
+from pyplotformat.io.archive import _encode_marker
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.decimate import restore_line
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _figure(scale=1.0):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 10, 1000)
+    axes.plot(x, scale*np.sin(x), label="sin")
+    axes.plot(x, scale*np.cos(x), label="cos")
+    axes.scatter(x[::100], scale*x[::100])
+
+    return figure
+
+
+def _line_data(figure):
+
+    return [(np.asarray(line.get_xdata()), np.asarray(line.get_ydata()))
+            for line in figure.get_axes()[0].get_lines()]
+
+
+def test_record_round_trip(tmp_path):
+
+    figure = _figure()
+    save_figure(tmp_path/"figure", figure)
+    loaded, axes = load_figure(tmp_path/"figure", reformat=False)
+
+    for (x, y), (lx, ly) in zip(_line_data(figure), _line_data(loaded)):
+        np.testing.assert_array_equal(x, lx)
+        np.testing.assert_array_equal(y, ly)
+
+    assert [line.get_label() for line in axes.get_lines()] == ["sin", "cos"]
+    assert len(axes.collections) == 1
+    np.testing.assert_array_equal(axes.collections[0].get_offsets(),
+                                  figure.get_axes()[0].collections[0].get_offsets())
+
+
+def test_pickle_requires_opt_in(tmp_path):
+
+    (tmp_path/"legacy.fig").write_bytes(b"not a figure record")
+
+    with pytest.raises(ValueError):
+        load_figure(tmp_path/"legacy")
+
+
+def test_archive_round_trip(tmp_path):
+
+    with FigureArchive(tmp_path/"figures", mode="w") as archive:
+        archive.append("a", _figure(1.0))
+        archive.append("b", _figure(2.0))
+
+    with FigureArchive(tmp_path/"figures", mode="a") as archive:
+        archive.append("c", _figure(3.0))
+
+    archive = FigureArchive(tmp_path/"figures")
+    assert archive.keys() == ["a", "b", "c"]
+
+    for key, scale in zip("abc", (1.0, 2.0, 3.0)):
+        figure, _ = archive.load(key, reformat=False)
+        expected = _line_data(_figure(scale))
+        for (x, y), (lx, ly) in zip(expected, _line_data(figure)):
+            np.testing.assert_array_equal(x, lx)
+            np.testing.assert_array_equal(y, ly)
+
+
+def test_archive_recovers_unflushed_append(tmp_path):
+
+    with FigureArchive(tmp_path/"figures", mode="w") as archive:
+        archive.append("a", _figure(1.0))
+        archive.append("b", _figure(2.0))
+
+    # Append without flushing and stop the process
+    script = ("import os, sys\n"
+              "sys.path.insert(0, {root!r})\n"
+              "from pyplotformat.io import FigureArchive\n"
+              "sys.path.insert(0, {tests!r})\n"
+              "from test_archive import _figure\n"
+              "archive = FigureArchive({name!r}, mode='a')\n"
+              "archive.append('c', _figure(3.0))\n"
+              "os._exit(0)\n").format(root=str(_ROOT), tests=str(Path(__file__).parent),
+                                      name=str(tmp_path/"figures"))
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    archive = FigureArchive(tmp_path/"figures")
+    assert archive.keys() == ["a", "b"]
+    np.testing.assert_array_equal(_line_data(archive.load("b", reformat=False)[0])[0][1],
+                                  _line_data(_figure(2.0))[0][1])
+
+    # The archive can be appended to again after the interrupted append
+    with FigureArchive(tmp_path/"figures", mode="a") as archive:
+        archive.append("c", _figure(3.0))
+
+    assert FigureArchive(tmp_path/"figures").keys() == ["a", "b", "c"]
+
+
+def test_grid_round_trip(tmp_path):
+
+    figure = Figure()
+    axes = figure.subplots(2, 2, sharex=True, sharey=True)
+    x = np.linspace(0, 10, 100)
+    for scale, ax in enumerate(axes.flat, start=1):
+        ax.plot(x, scale*np.sin(x))
+
+    save_figure(tmp_path/"grid", figure)
+    loaded, _ = load_figure(tmp_path/"grid", reformat=False)
+    panels = loaded.get_axes()
+
+    assert [ax.get_subplotspec().get_geometry() for ax in panels] == \
+           [ax.get_subplotspec().get_geometry() for ax in axes.flat]
+    assert all(panels[0].get_shared_x_axes().joined(panels[0], ax) for ax in panels)
+    assert all(panels[0].get_shared_y_axes().joined(panels[0], ax) for ax in panels)
+    for ax, original in zip(panels, axes.flat):
+        np.testing.assert_allclose(ax.get_position().bounds, original.get_position().bounds)
+
+
+def test_decimated_lines_keep_full_data(tmp_path):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 10, 200_000)
+    axes.plot(x, np.sin(50*x))
+    Format2D()(figure, decimate="minmax")
+    decimated = len(axes.lines[0].get_xdata())
+    assert decimated < x.size
+
+    save_figure(tmp_path/"figure", figure)
+
+    raw, _ = load_figure(tmp_path/"figure", reformat=False)
+    np.testing.assert_array_equal(raw.get_axes()[0].lines[0].get_xdata(), x)
+
+    _, loaded = load_figure(tmp_path/"figure")
+    assert len(loaded.lines[0].get_xdata()) == decimated
+    assert restore_line(loaded.lines[0])
+    np.testing.assert_array_equal(loaded.lines[0].get_ydata(), np.sin(50*x))
+
+
+@pytest.mark.parametrize("marker", ["o", 4, (5, 1, 0), [(0, 0), (1, 1), (1, 0)],
+                                    MplPath.unit_regular_star(5)])
+def test_marker_round_trip(tmp_path, marker):
+
+    figure = Figure()
+    figure.add_subplot().plot([0, 1], [0, 1], marker=marker, fillstyle="left",
+                              markerfacecolor="white")
+    save_figure(tmp_path/"figure", figure)
+    _, axes = load_figure(tmp_path/"figure", reformat=False)
+    line = figure.get_axes()[0].lines[0]
+    loaded = axes.lines[0]
+
+    np.testing.assert_allclose(loaded._marker.get_path().vertices, # pylint: disable=protected-access
+                               line._marker.get_path().vertices) # pylint: disable=protected-access
+    assert loaded.get_fillstyle() == "left"
+    assert mcolors.same_color(loaded.get_markerfacecolor(), "white")
+    assert mcolors.same_color(loaded.get_markeredgecolor(), line.get_color())
+
+
+def test_unsupported_marker_raises():
+
+    with pytest.raises(ValueError):
+        _encode_marker(object())
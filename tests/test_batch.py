@@ -0,0 +1,98 @@
+'''
+Batch and background writing tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+from matplotlib.figure import Figure
+
+from pyplotformat.io import BackgroundWriter, write_many
+from pyplotformat.plot import Format2D
+
+
+def _build(scale=1.0):
+
+    figure = Figure()
+    figure.add_subplot().plot([0, 1, 2], [0, scale, 2*scale])
+
+    return figure
+
+
+def _fail():
+
+    raise RuntimeError("figure failed")
+
+
+def _write_text(figure, filepath):
+
+    with open(filepath, "w", encoding="utf-8") as out_file:
+        out_file.write("{:g} {:g}".format(*figure.get_axes()[0].get_xlim()))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_format_many_returns_results_in_order(workers):
+
+    figures = [_build, _fail, _build]
+    results = Format2D().format_many(figures, [{"xlabel": "a"}, {}, {"xlabel": "c"}],
+                                     workers=workers)
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[2].result.get_axes()[0].get_xlabel() == "c"
+
+
+def test_format_many_writes_figures(tmp_path):
+
+    paths = [str(tmp_path/"a.txt"), str(tmp_path/"b.txt")]
+    results = Format2D().format_many([_build, _build], {"xylim": [0, 5, 0, 5]}, paths,
+                                     workers=2, writer=_write_text)
+
+    assert [result.result for result in results] == paths
+    assert (tmp_path/"a.txt").read_text(encoding="utf-8") == "0 5"
+
+
+def test_format_many_checks_lengths():
+
+    with pytest.raises(ValueError):
+        Format2D().format_many([_build], [{}, {}])
+
+
+def test_write_many_writes_pdfs(tmp_path):
+
+    results = write_many([_build(), _build], [tmp_path/"a", tmp_path/"b"], workers=2)
+
+    assert all(result.ok for result in results)
+    assert (tmp_path/"a.pdf").read_bytes().startswith(b"%PDF")
+    assert (tmp_path/"b.pdf").exists()
+
+
+def test_background_writer_copies_submitted_figures(tmp_path):
+
+    figure = _build()
+    figure.get_axes()[0].set_xlim(0, 3)
+
+    with BackgroundWriter(workers=1, max_queue=1, writer=_write_text) as background:
+        future = background.submit(figure, str(tmp_path/"first.txt"))
+        figure.get_axes()[0].set_xlim(0, 9)
+        background.submit(figure, str(tmp_path/"second.txt"))
+        assert background.flush() == []
+
+    assert future.result() == str(tmp_path/"first.txt")
+    assert (tmp_path/"first.txt").read_text(encoding="utf-8") == "0 3"
+    assert (tmp_path/"second.txt").read_text(encoding="utf-8") == "0 9"
+
+    with pytest.raises(RuntimeError):
+        background.submit(figure, str(tmp_path/"third.txt"))
+
+
+def test_background_writer_returns_errors(tmp_path):
+
+    with BackgroundWriter(workers=1, writer=_write_text) as background:
+        future = background.submit(_build(), str(tmp_path/"missing"/"out.txt"))
+
+    assert isinstance(future.exception(), OSError)
+    with pytest.raises(ValueError):
+        BackgroundWriter(workers=1, max_queue=0)
@@ -0,0 +1,57 @@
+'''
+Line color and palette tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib import colors as mcolors
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.colors import line_colors, palette_colors
+
+
+def test_palette_list_is_repeated():
+
+    colors = palette_colors(["red", "blue"], 5)
+    np.testing.assert_array_equal(colors, mcolors.to_rgba_array(["r", "b", "r", "b", "r"]))
+
+
+def test_palette_colormap_is_sampled_evenly():
+
+    colors = palette_colors("viridis", 3)
+    cmap = matplotlib.colormaps["viridis"]
+    np.testing.assert_allclose(colors, [cmap(0.0), cmap(0.5), cmap(1.0)])
+
+    with pytest.raises(ValueError):
+        palette_colors("not-a-colormap", 3)
+
+
+def test_overrides_keep_palette_order():
+
+    colors = line_colors(3, color=[None, "black", None], palette=["red", "blue"])
+    np.testing.assert_array_equal(colors, mcolors.to_rgba_array(["red", "black", "blue"]))
+
+    with pytest.raises(ValueError):
+        line_colors(3, color=["black"])
+
+
+def test_blackline():
+
+    np.testing.assert_array_equal(line_colors(2, blackline=True), mcolors.to_rgba_array(["k"]*2))
+
+
+def test_formatter_colors_many_lines():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    for i in range(30):
+        axes.plot([0, 1], [i, i])
+    Format2D()(figure, palette="viridis")
+
+    colors = [line.get_color() for line in axes.lines]
+    assert mcolors.same_color(colors[0], matplotlib.colormaps["viridis"](0.0))
+    assert mcolors.same_color(colors[-1], matplotlib.colormaps["viridis"](1.0))
@@ -0,0 +1,82 @@
+'''
+Line consolidation and rasterization tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.consolidate import consolidate_lines, restore_lines
+from pyplotformat.plot.rasterize import rasterize_artists, vectorize_artists
+
+
+def _sweep(n_lines=20, **kwargs):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 1, 50)
+    for i in range(n_lines):
+        axes.plot(x, i*x, color="k", label="sweep", **kwargs)
+    axes.plot(x, -x, color="r", label="reference")
+
+    return figure, axes
+
+
+def test_lines_with_same_style_are_consolidated():
+
+    _, axes = _sweep()
+    hidden = consolidate_lines(axes)
+
+    assert len(hidden) == 20
+    collections = [c for c in axes.collections if isinstance(c, LineCollection)]
+    assert len(collections) == 1 and len(collections[0].get_segments()) == 20
+    assert collections[0].get_label() == "sweep"
+    assert axes.get_legend_handles_labels()[1] == ["reference", "sweep"]
+
+    restore_lines(hidden)
+    assert all(line.get_visible() for line in axes.lines)
+    assert {line.get_label() for line in axes.lines} == {"sweep", "reference"}
+
+
+def test_marker_lines_are_not_consolidated():
+
+    _, axes = _sweep(marker="o")
+    assert consolidate_lines(axes) == {}
+
+
+def test_formatter_consolidation_can_be_undone():
+
+    figure, axes = _sweep()
+    formatter = Format2D()
+
+    # Black lines share a style, the palette would give each line its own color
+    formatter(figure, consolidate=True, blackline=True)
+    assert len(axes.collections) == 1
+
+    formatter(figure, consolidate=False, blackline=True)
+    assert len(axes.collections) == 0
+    assert all(line.get_visible() for line in axes.lines)
+
+
+def test_heavy_artists_are_rasterized():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    heavy, = axes.plot(np.arange(10_000), np.arange(10_000))
+    light, = axes.plot([0, 1], [0, 1])
+
+    rasterized = rasterize_artists(axes, 1000)
+    assert rasterized == [heavy] and heavy.get_rasterized() and not light.get_rasterized()
+
+    vectorize_artists(rasterized)
+    assert not heavy.get_rasterized()
+
+    formatter = Format2D()
+    formatter(figure, rasterize=1000)
+    assert heavy.get_rasterized()
+    formatter(figure, rasterize=None)
+    assert not heavy.get_rasterized()
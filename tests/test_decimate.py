@@ -0,0 +1,90 @@
+'''
+Line decimation tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.decimate import (decimate_line, lttb_decimate, minmax_decimate,
+                                        original_data, restore_line)
+
+
+def _line(n_points=100_000, **kwargs):
+
+    axes = Figure().add_subplot()
+    x = np.linspace(0, 10, n_points)
+    y = np.random.default_rng(0).normal(size=n_points)
+    line, = axes.plot(x, y, **kwargs)
+
+    return axes, line, x, y
+
+
+def test_minmax_keeps_column_envelope():
+
+    _, _, x, y = _line()
+    index = minmax_decimate(x, y, 100)
+
+    assert np.all(np.diff(index) > 0)
+    assert index[0] == 0 and index[-1] == x.size - 1
+
+    columns = np.minimum((x/10*100).astype(int), 99)
+    for column in (0, 37, 99):
+        in_column = columns == column
+        kept = index[columns[index] == column]
+        assert y[kept].max() == y[in_column].max()
+        assert y[kept].min() == y[in_column].min()
+
+
+def test_lttb_keeps_end_points():
+
+    _, _, x, y = _line(10_000)
+    index = lttb_decimate(x, y, 200)
+
+    assert index.size == 200
+    assert index[0] == 0 and index[-1] == x.size - 1
+
+
+def test_decimate_and_restore_line():
+
+    axes, line, x, y = _line()
+    axes.set_xlim(0, 10)
+
+    assert decimate_line(line, 100)
+    assert len(line.get_xdata()) < x.size
+    np.testing.assert_array_equal(original_data(line)[1], y)
+
+    assert restore_line(line)
+    np.testing.assert_array_equal(line.get_ydata(), y)
+    assert not restore_line(line)
+
+
+def test_marker_lines_and_invalid_methods():
+
+    _, line, x, _ = _line(marker="o")
+    assert not decimate_line(line, 100)
+    assert len(line.get_xdata()) == x.size
+
+    with pytest.raises(ValueError):
+        decimate_line(line, 100, "every-other")
+
+
+def test_zoomed_view_keeps_visible_resolution():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 1000, 200_000)
+    axes.plot(x, np.sin(x))
+
+    Format2D()(figure, decimate="minmax", xylim=[0, 1000, -1, 1])
+    full_view = np.count_nonzero(axes.lines[0].get_xdata() <= 10)
+
+    Format2D()(figure, decimate="minmax", xylim=[0, 10, -1, 1])
+    zoomed = np.count_nonzero(axes.lines[0].get_xdata() <= 10)
+
+    assert zoomed > 10*full_view
+    assert len(original_data(axes.lines[0])[0]) == x.size
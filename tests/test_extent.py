@@ -0,0 +1,81 @@
+'''
+Data extent tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from pyplotformat.plot.extent import axes_extent
+
+
+def _axes():
+
+    return Figure().add_subplot()
+
+
+def test_extent_ignores_invalid_values():
+
+    axes = _axes()
+    y = np.ma.masked_array([1.0, np.nan, -np.inf, 5.0, 100.0], mask=[0, 0, 0, 0, 1])
+    axes.plot([0, 1, 2, 3, 4], y)
+
+    extent = axes_extent(axes)
+    assert (extent.xmin, extent.xmax) == (0, 4)
+    assert (extent.ymin, extent.ymax) == (1, 5)
+
+
+def test_extent_of_negative_data():
+
+    axes = _axes()
+    axes.plot([-3, -1], [-10, -2])
+
+    extent = axes_extent(axes)
+    assert (extent.xmin, extent.xmax, extent.ymin, extent.ymax) == (-3, -1, -10, -2)
+
+
+def test_extent_of_collections_images_and_patches():
+
+    axes = _axes()
+    axes.scatter([1, 2], [3, 4])
+    axes.fill_between([0, 5], [-1, -1], [1, 1])
+    axes.imshow(np.zeros((2, 2)), extent=(-2, 0, 0, 8))
+    axes.add_patch(matplotlib.patches.Rectangle((6, 0), 1, 1))
+
+    extent = axes_extent(axes)
+    assert (extent.xmin, extent.xmax, extent.ymin, extent.ymax) == (-2, 7, -1, 8)
+
+
+def test_axis_lines_only_use_data_coordinates():
+
+    axes = _axes()
+    axes.plot([100, 200], [10, 12])
+    axes.axhline(11)
+    axes.axvline(150)
+
+    extent = axes_extent(axes)
+    assert (extent.xmin, extent.xmax, extent.ymin, extent.ymax) == (100, 200, 10, 12)
+
+
+def test_running_extent_scans_appended_points():
+
+    axes = _axes()
+    line, = axes.plot([0, 1], [0, 1])
+    axes_extent(axes, running=True)
+
+    line.set_data([0, 1, 2], [0, 1, -5])
+    extent = axes_extent(axes, running=True)
+    assert (extent.xmax, extent.ymin) == (2, -5)
+
+    # Shorter data replaced the line and is scanned again
+    line.set_data([10], [20])
+    extent = axes_extent(axes, running=True)
+    assert (extent.xmin, extent.xmax, extent.ymin, extent.ymax) == (10, 10, 20, 20)
+
+
+def test_empty_axes_extent_is_invalid():
+
+    extent = axes_extent(_axes())
+    assert not extent.valid_x and not extent.valid_y
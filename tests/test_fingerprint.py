@@ -0,0 +1,62 @@
+'''
+Data signature and stage skipping tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.fingerprint import data_signature
+
+
+def _figure(y):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    line, = axes.plot(np.arange(len(y)), y)
+
+    return figure, axes, line
+
+
+def test_in_place_edit_changes_signature():
+
+    figure, _, line = _figure(np.zeros(100_000))
+    signature = data_signature(figure)
+
+    line.get_ydata()[5] = 1e9
+    assert data_signature(figure) != signature
+
+
+def test_mask_change_changes_signature():
+
+    figure, _, line = _figure(np.ma.masked_array(np.arange(10.0), mask=np.zeros(10, bool)))
+    signature = data_signature(figure)
+
+    line.get_ydata()[3] = np.ma.masked
+    assert data_signature(figure) != signature
+
+
+def test_in_place_edit_updates_limits():
+
+    figure, axes, line = _figure(np.arange(100_000.0))
+    formatter = Format2D()
+    formatter(figure, lypad=1, uypad=1)
+
+    line.get_ydata()[5] = 1e9
+    formatter(figure, lypad=1, uypad=1)
+    assert axes.get_ylim() == (0, 1e9)
+
+
+def test_unchanged_figure_skips_stages():
+
+    figure, axes, _ = _figure(np.arange(10.0))
+    formatter = Format2D(profile=True)
+    formatter(figure, annotate=True, shortlabel=["a"])
+    texts = len(axes.texts)
+
+    formatter(figure, annotate=True, shortlabel=["a"])
+    assert len(axes.texts) == texts
+    assert "line_annotation" not in formatter.stats.stages
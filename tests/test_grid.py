@@ -0,0 +1,72 @@
+'''
+Subplot grid formatting tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+
+
+def _grid(**kwargs):
+
+    figure = Figure()
+    axes = figure.subplots(2, 2, **kwargs)
+    x = np.linspace(0, 10, 100)
+    for scale, ax in enumerate(axes.flat, start=1):
+        ax.plot(scale*x, np.sin(x)*scale)
+
+    return figure, axes
+
+
+def test_labels_on_outer_panels_and_figure_title():
+
+    figure, _ = _grid(sharex=True, sharey=True)
+    _, panels = Format2D()(figure, xlabel="time", ylabel="value", title="Grid")
+
+    assert len(panels) == 4
+    assert [ax.get_xlabel() for ax in panels] == ["", "", "time", "time"]
+    assert [ax.get_ylabel() for ax in panels] == ["value", "", "value", ""]
+    assert figure._suptitle.get_text() == "Grid" # pylint: disable=protected-access
+    assert all(ax.get_title() == "" for ax in panels)
+
+
+def test_shared_axes_get_the_same_limits_and_ticks():
+
+    figure, axes = _grid(sharex="col", sharey="row")
+    Format2D()(figure)
+
+    assert axes[0, 0].get_xlim() == axes[1, 0].get_xlim()
+    assert axes[0, 0].get_xlim() != axes[0, 1].get_xlim()
+    assert axes[1, 0].get_ylim() == axes[1, 1].get_ylim()
+    np.testing.assert_array_equal(axes[0, 1].get_xticks(), axes[1, 1].get_xticks())
+
+
+def test_colorbars_and_twins_are_not_formatted():
+
+    figure, axes = _grid()
+    mesh = axes[0, 0].pcolormesh(np.random.default_rng(0).random((4, 4)))
+    colorbar = figure.colorbar(mesh, ax=axes[0, 0])
+    twin = axes[1, 1].twinx()
+    twin.plot([0, 1], [0, 1])
+    twin_color = twin.lines[0].get_color()
+
+    _, panels = Format2D()(figure, xlabel="x")
+
+    assert list(panels) == list(axes.flat)
+    assert colorbar.ax.get_xlabel() == ""
+    assert twin.lines[0].get_color() == twin_color
+
+
+def test_figure_without_panels_raises():
+
+    figure = Figure()
+    figure.add_axes([0.1, 0.1, 0.3, 0.3]).plot([0, 1])
+    figure.add_axes([0.5, 0.5, 0.3, 0.3]).plot([0, 1])
+
+    with pytest.raises(ValueError):
+        Format2D()(figure)
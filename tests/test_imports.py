@@ -0,0 +1,35 @@
+'''
+Cold-start import tests.
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _loaded_modules(statement, modules):
+
+    script = ("import sys\n"
+              "sys.path.insert(0, {root!r})\n"
+              "{statement}\n"
+              "print(','.join(m for m in {modules!r} if m in sys.modules))\n"
+              ).format(root=str(_ROOT), statement=statement, modules=modules)
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                            text=True).stdout
+
+    return [module for module in output.strip().split(",") if module]
+
+
+def test_package_import_is_lazy():
+
+    assert _loaded_modules("import pyplotformat", ("matplotlib", "pypdf")) == []
+
+
+def test_formatters_do_not_load_batch_modules():
+
+    modules = ("matplotlib.pyplot", "multiprocessing", "concurrent.futures", "pypdf",
+               "pyplotformat.io.batch")
+
+    assert _loaded_modules("from pyplotformat.plot import Format2D", modules) == []
@@ -0,0 +1,121 @@
+'''
+Fixed layout and line annotation tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D, FormatPolar
+from pyplotformat.plot.annotate import place_labels
+
+
+def _draw(figure):
+
+    renderer = figure._get_renderer() # pylint: disable=protected-access
+    figure.draw(renderer)
+
+    return renderer
+
+
+def _assert_inside(figure, bbox):
+
+    assert bbox.x0 >= 0 and bbox.y0 >= 0
+    assert bbox.x1 <= figure.bbox.width and bbox.y1 <= figure.bbox.height
+
+
+def test_place_labels_resolves_overlaps():
+
+    targets = np.array([5.0, 5.0, 5.2, 40.0, 0.0])
+    placed = place_labels(targets, 2.0, 0.0, 50.0)
+
+    ordered = placed[np.argsort(targets, kind="stable")]
+    assert np.all(np.diff(ordered) >= 2.0 - 1e-9)
+    assert placed[3] == 40.0
+    assert placed.min() >= 0.0 and placed.max() <= 50.0
+
+
+def test_fixed_layout_fits_text():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    axes.plot([0, 1], [1.2e7, 1.3e7])
+    Format2D()(figure, layout="fixed", xlabel="time", ylabel="value", title="Title")
+
+    _assert_inside(figure, axes.get_tightbbox(_draw(figure)))
+
+
+def test_fixed_layout_fits_each_direction():
+
+    # The title does not fit the figure height, the tick labels are still fitted horizontally
+    figure = Figure()
+    axes = figure.add_subplot()
+    axes.plot([0, 1], [1.2e7, 1.3e7])
+    Format2D()(figure, layout="fixed", ylabel="value", title="\n".join(["Title"]*14))
+
+    renderer = _draw(figure)
+    tight = axes.get_tightbbox(renderer)
+    assert tight.x0 >= 0 and tight.x1 <= figure.bbox.width
+    assert axes.get_position().height == pytest.approx(0.1)
+
+
+def test_fixed_layout_is_cached():
+
+    def formatted():
+        figure = Figure()
+        axes = figure.add_subplot()
+        axes.plot([0, 1], [0, 1])
+        Format2D()(figure, layout="fixed", xlabel="x", ylabel="y")
+        return axes.get_position().bounds
+
+    assert formatted() == formatted()
+
+
+def test_fixed_layout_of_grid():
+
+    figure = Figure()
+    for axes in figure.subplots(2, 2).flat:
+        axes.plot([0, 1], [0, 1000])
+    Format2D()(figure, layout="fixed", xlabel="time", ylabel="value", title="Grid")
+
+    renderer = _draw(figure)
+    for axes in figure.get_axes():
+        _assert_inside(figure, axes.get_tightbbox(renderer))
+
+
+def test_annotations_are_placed_after_fixed_layout():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 1, 50)
+    for i in range(6):
+        axes.plot(x, 0.5 + 0.01*i*x)
+    axes.plot(x, 3*x)
+
+    # Tall axis labels leave a short axes after the layout
+    Format2D()(figure, layout="fixed", annotate=True, shortlabel=list("abcdefg"),
+               xlabel="x" + "\n"*8, ylabel="y")
+
+    renderer = _draw(figure)
+    boxes = sorted((text.get_window_extent(renderer) for text in axes.texts),
+                   key=lambda box: box.y0)
+    for lower, upper in zip(boxes[:-1], boxes[1:]):
+        assert upper.y0 >= lower.y1 - 1e-6
+
+
+def test_polar_annotations_are_placed():
+
+    figure = Figure()
+    axes = figure.add_subplot(projection="polar")
+    theta = np.linspace(0, 2*np.pi, 50)
+    axes.plot(theta, theta/7)
+    axes.plot(theta, 0.99*theta/7)
+    FormatPolar()(figure, annotate=True, shortlabel=["a", "b"])
+
+    renderer = _draw(figure)
+    lower, upper = sorted((text.get_window_extent(renderer) for text in axes.texts),
+                          key=lambda box: box.y0)
+    assert upper.y0 >= lower.y1 - 1e-6
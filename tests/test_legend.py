@@ -0,0 +1,82 @@
+'''
+Legend de-duplication tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from pyplotformat.io import load_figure, save_figure
+from pyplotformat.plot import Format2D, FormatLegend
+
+
+def _figure(colors, labels=None, **kwargs):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    x = np.linspace(0, 1, 10)
+    labels = labels or ["line {}".format(i) for i in range(len(colors))]
+    for scale, (color, label) in enumerate(zip(colors, labels)):
+        axes.plot(x, scale*x, color=color, label=label, **kwargs)
+
+    return figure
+
+
+def _legend_labels(legend_figure):
+
+    return [text.get_text() for text in legend_figure.legends[0].get_texts()]
+
+
+def test_equal_colors_are_one_entry():
+
+    first = _figure(["red", "blue"], marker="o")
+    second = _figure(["#ff0000", (0, 0, 1)], marker="o", markerfacecolor="auto")
+    third = _figure([(1, 0, 0, 1), "b"], marker="o")
+
+    assert _legend_labels(FormatLegend()(first, second, third)) == ["line 0", "line 1"]
+
+
+def test_different_styles_are_kept():
+
+    first = _figure(["red"])
+    second = _figure(["red"], linestyle="--")
+    third = _figure(["green"])
+    fourth = _figure(["red"], marker="o", markerfacecolor="white")
+    fifth = _figure(["red"], labels=["_hidden"])
+
+    assert _legend_labels(FormatLegend()(first, second, third, fourth, fifth)) == ["line 0"]*4
+
+
+def test_reloaded_figure_is_deduplicated(tmp_path):
+
+    figure = _figure([None]*15, marker="o")
+    Format2D()(figure)
+    save_figure(tmp_path/"figure", figure)
+    reloaded, _ = load_figure(tmp_path/"figure")
+
+    assert len(_legend_labels(FormatLegend()(figure, reloaded))) == 15
+
+
+def test_reused_formatter_keeps_no_state():
+
+    legend = FormatLegend()
+    figure = _figure(["red", "blue"])
+
+    assert _legend_labels(legend(figure)) == _legend_labels(legend(figure))
+
+
+def test_auto_ncol_fits_max_width():
+
+    legend = FormatLegend(max_width="single")
+    assert legend._auto_ncol([]) == 1 # pylint: disable=protected-access
+    assert legend._auto_ncol(["a very long legend label "*4]) == 1 # pylint: disable=protected-access
+
+    labels = ["l{}".format(i) for i in range(12)]
+    ncol = legend._auto_ncol(labels) # pylint: disable=protected-access
+    assert ncol > 1
+    assert FormatLegend(max_width="double")._auto_ncol(labels) >= ncol # pylint: disable=protected-access
+
+    figure = FormatLegend()(_figure([None]*12, labels=labels), ncol=None)
+    assert figure.legends[0]._ncols == ncol # pylint: disable=protected-access
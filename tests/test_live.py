@@ -0,0 +1,62 @@
+'''
+Live mode tests, where points are appended to the lines between calls.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+
+
+def _live_figure(n_points):
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    line, = axes.plot(np.arange(n_points), np.arange(n_points))
+
+    return figure, axes, line
+
+
+def test_growing_data_updates_limits_and_ticks():
+
+    figure, axes, line = _live_figure(2)
+    formatter = Format2D()
+
+    formatter(figure, live=True, lxpad=1, uxpad=1)
+    np.testing.assert_allclose(axes.get_xticks(), [0, 0.2, 0.4, 0.6, 0.8, 1])
+
+    line.set_data(np.arange(5000), np.arange(5000))
+    formatter(figure, live=True, lxpad=1, uxpad=1)
+
+    assert axes.get_xlim() == (0, 4999)
+    np.testing.assert_allclose(axes.get_xticks(), [0, 1000, 2000, 3000, 4000, 5000])
+    assert axes.get_xticklabels()[-2].get_text() == "4000"
+
+
+def test_unchanged_refresh_keeps_ticks():
+
+    figure, axes, line = _live_figure(100)
+    formatter = Format2D()
+
+    formatter(figure, live=True, xylim=[0, 100, 0, 100])
+    locator = axes.xaxis.get_major_locator()
+
+    # The same limits give the same cached plan, which is not applied again
+    line.set_data(np.arange(101), np.arange(101))
+    formatter(figure, live=True, xylim=[0, 100, 0, 100])
+    assert axes.xaxis.get_major_locator() is locator
+
+
+def test_replaced_data_is_rescanned():
+
+    figure, axes, line = _live_figure(1000)
+    formatter = Format2D()
+
+    formatter(figure, live=True, lypad=1, uypad=1)
+    line.set_data(np.arange(10), -np.arange(10))
+    formatter(figure, live=True, lypad=1, uypad=1)
+
+    assert axes.get_ylim() == (-9, 0)
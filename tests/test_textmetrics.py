@@ -0,0 +1,40 @@
+'''
+Text metrics cache tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.font_manager import FontProperties
+
+from pyplotformat.plot.textmetrics import TextMetricsCache
+
+
+def test_sizes_match_the_renderer_and_are_cached():
+
+    cache = TextMetricsCache()
+    font = FontProperties(size=10)
+
+    width, height, descent = cache.measure("label", font)
+    expected = RendererAgg(1, 1, 72).get_text_width_height_descent("label", font, ismath=False)
+    assert (width, height, descent) == pytest.approx(expected)
+
+    assert cache.measure("label", font) == (width, height, descent)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    rotated = cache.measure("label", font, rotation=90)
+    assert rotated[:2] == pytest.approx((height, width))
+
+
+def test_least_recently_used_entries_are_evicted():
+
+    cache = TextMetricsCache(maxsize=2)
+    font = FontProperties(size=10)
+    for text in ("a", "b", "a", "c"):
+        cache.measure(text, font)
+
+    assert len(cache) == 2
+    cache.measure("a", font)
+    assert cache.hits == 2
@@ -0,0 +1,89 @@
+'''
+Tick plan tests.
+'''
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.ticker as mticker
+import numpy as np
+from matplotlib.figure import Figure
+
+from pyplotformat.plot import Format2D
+from pyplotformat.plot.ticks import plan_ticks
+
+
+def _figure():
+
+    figure = Figure()
+    axes = figure.add_subplot()
+    axes.plot([0, 1], [0, 1])
+
+    return figure, axes
+
+
+def test_plan_labels_and_manual_locations():
+
+    _, axes = _figure()
+    axes.set_xlim(0, 1)
+
+    plan = plan_ticks(axes.xaxis, fmt="{:.1f}")
+    assert plan.labels == tuple("{:.1f}".format(loc) for loc in plan.locations)
+    assert plan_ticks(axes.xaxis, locations=[0, 0.5], fmt=lambda loc: "x").labels == ("x", "x")
+
+
+def test_reformat_with_new_limits_updates_ticks():
+
+    figure, axes = _figure()
+    formatter = Format2D()
+
+    formatter(figure, xylim=[0, 1, 0, 1])
+    np.testing.assert_allclose(axes.get_xticks(), [0, 0.2, 0.4, 0.6, 0.8, 1])
+
+    formatter(figure, xylim=[0, 100, 0, 100])
+    np.testing.assert_allclose(axes.get_xticks(), [0, 20, 40, 60, 80, 100])
+    np.testing.assert_allclose(axes.get_yticks(), [0, 20, 40, 60, 80, 100])
+
+
+def test_plan_cache_serves_formatted_axes():
+
+    figure, axes = _figure()
+    Format2D()(figure, xylim=[0, 3, 0, 3])
+
+    # The applied plan replaced the locator, the same limits are still planned from the cache
+    assert plan_ticks(axes.xaxis) is plan_ticks(axes.xaxis)
+    other, other_axes = _figure()
+    Format2D()(other, xylim=[0, 3, 0, 3])
+    assert plan_ticks(other_axes.xaxis) is plan_ticks(axes.xaxis)
+
+
+def _visible_ticks(axes):
+
+    ticks = axes.get_xticks()
+    low, high = axes.get_xlim()
+    return ticks[(ticks >= low) & (ticks <= high)]
+
+
+def test_custom_locator_is_kept():
+
+    figure, axes = _figure()
+    axes.xaxis.set_major_locator(mticker.MultipleLocator(0.25))
+    formatter = Format2D()
+
+    formatter(figure, xylim=[0, 1, 0, 1])
+    np.testing.assert_allclose(_visible_ticks(axes), [0, 0.25, 0.5, 0.75, 1])
+
+    formatter(figure, xylim=[0, 2, 0, 1])
+    np.testing.assert_allclose(_visible_ticks(axes), np.arange(0, 2.01, 0.25))
+
+
+def test_scale_change_uses_new_default_locator():
+
+    figure, axes = _figure()
+    axes.lines[0].set_data([1, 1000], [1, 2])
+    formatter = Format2D()
+
+    formatter(figure)
+    formatter(figure, xscale="log")
+    ticks = axes.get_xticks()
+    np.testing.assert_allclose(np.log10(ticks), np.round(np.log10(ticks)))